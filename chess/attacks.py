@@ -0,0 +1,56 @@
+"""Attack tables kept up to date as the pieces move"""
+from .bitboard import BISHOP, ROOK, QUEEN, iter_bits
+
+class AttackMap(object):
+    """Which squares the piece on each square attacks, and which squares each square
+    is attacked from. The grid marks the squares it changes as dirty, and the tables
+    are brought up to date on the next query by recomputing only the pieces on dirty
+    squares and the sliding pieces whose rays reach them."""
+    __slots__ = ('grid', 'attacks', 'attackers', 'dirty')
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.attacks = [0] * 64   # squares attacked by the piece on the square
+        self.attackers = [0] * 64 # squares whose pieces attack the square
+        self.dirty = 0
+
+    def refresh(self):
+        """Recompute the attacks affected by the changes since the last refresh"""
+        dirty = self.dirty
+        if not dirty:
+            return
+        self.dirty = 0
+        grid = self.grid
+        attacks, attackers = self.attacks, self.attackers
+        kinds = grid.kinds
+        sliders = kinds[BISHOP] | kinds[ROOK] | kinds[QUEEN]
+        affected = dirty
+        for square in iter_bits(dirty):
+            # a ray reaching a changed square may now stop earlier or go further
+            affected |= attackers[square] & sliders
+        for square in iter_bits(affected):
+            old = attacks[square]
+            new = grid.attacks(square)
+            if old == new:
+                continue
+            attacks[square] = new
+            mask = 1 << square
+            for target in iter_bits(old & ~new):
+                attackers[target] &= ~mask
+            for target in iter_bits(new & ~old):
+                attackers[target] |= mask
+
+    def attackers_of(self, square, side):
+        """Bitboard of side's pieces attacking the square"""
+        if self.dirty:
+            self.refresh()
+        return self.attackers[square] & self.grid.colors[side]
+
+    def attacked(self, side):
+        """Bitboard of the squares attacked by side"""
+        if self.dirty:
+            self.refresh()
+        attacked = 0
+        for square in iter_bits(self.grid.colors[side]):
+            attacked |= self.attacks[square]
+        return attacked
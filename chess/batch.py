@@ -0,0 +1,235 @@
+"""Move generation for whole batches of positions at once, with NumPy.
+
+The positions are an array of shape (N, 14) of uint64 bitboards, laid out like the
+planes of chess.tensors and made with chess.tensors.bitboard_array(). Rather than
+going through the pieces one by one, every piece of a kind is moved at once by
+shifting its bitboard, and every position of the batch at once by doing it on the
+arrays, so that a batch costs a few thousand array operations whatever its size.
+
+The results are the same as the ones of the games: legal_move_counts() counts the
+moves of legal_moves() for the side to move, with promotions to a queen only, and
+in_check() agrees with Chess.is_in_check()."""
+from .bitboard import WHITE, BLACK, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING
+from .tensors import PIECE_PLANES, SIDE_TO_MOVE, EN_PASSANT, bitboard_array
+
+try:
+    import numpy
+except ImportError: # pragma: no cover
+    numpy = None
+
+if numpy is not None:
+    _FULL = numpy.uint64(0xFFFFFFFFFFFFFFFF)
+    _ZERO = numpy.uint64(0)
+    _NOT_A = numpy.uint64(0xFEFEFEFEFEFEFEFE)
+    _NOT_H = numpy.uint64(0x7F7F7F7F7F7F7F7F)
+    _NOT_AB = numpy.uint64(0xFCFCFCFCFCFCFCFC)
+    _NOT_GH = numpy.uint64(0x3F3F3F3F3F3F3F3F)
+    _RANK_3 = numpy.uint64(0xFF << 16)
+    _RANK_4 = numpy.uint64(0xFF << 24)
+    _RANK_5 = numpy.uint64(0xFF << 32)
+    _RANK_6 = numpy.uint64(0xFF << 40)
+
+    # (shift, mask of the squares that can be reached without wrapping around a side
+    # of the board), a positive shift going up the square indices
+    _N, _S = (8, _FULL), (-8, _FULL)
+    _E, _W = (1, _NOT_A), (-1, _NOT_H)
+    _NE, _NW = (9, _NOT_A), (7, _NOT_H)
+    _SE, _SW = (-7, _NOT_A), (-9, _NOT_H)
+    _ORTHOGONAL = (_N, _E, _S, _W)
+    _DIAGONAL = (_NE, _SE, _SW, _NW)
+    _KNIGHT = ((17, _NOT_A), (15, _NOT_H), (10, _NOT_AB), (6, _NOT_GH),
+               (-6, _NOT_AB), (-10, _NOT_GH), (-15, _NOT_A), (-17, _NOT_H))
+    _KING = _ORTHOGONAL + _DIAGONAL
+    # the lines through the king a pinned piece can stay on, by direction
+    _AXIS = {_N: 0, _S: 0, _E: 1, _W: 1, _NE: 2, _SW: 2, _NW: 3, _SE: 3}
+    _BACK = {_NE: _SW, _SW: _NE, _NW: _SE, _SE: _NW}
+
+def _require_numpy():
+    if numpy is None:
+        raise ImportError('NumPy is needed to work on batches of positions')
+
+def _shift(boards, step):
+    shift, mask = step
+    if shift > 0:
+        return (boards << numpy.uint64(shift)) & mask
+    return (boards >> numpy.uint64(-shift)) & mask
+
+def _count(boards):
+    if hasattr(numpy, 'bitwise_count'):
+        return numpy.bitwise_count(boards).astype(numpy.int64)
+    # NumPy before 2.0
+    bits = numpy.unpackbits(numpy.ascontiguousarray(boards).view(numpy.uint8))
+    return bits.reshape(-1, 64).sum(axis=1, dtype=numpy.int64)
+
+def _slide(boards, empty, step):
+    """Squares attacked along a direction from the squares of the bitboards, up to and
+    including the first occupied square"""
+    attacks = _ZERO
+    for _ in range(7):
+        boards = _shift(boards, step)
+        attacks = attacks | boards
+        boards = boards & empty
+    return attacks
+
+def _pieces(boards, side):
+    """The bitboards of side's pieces by kind, and of all its pieces"""
+    first = 6 * side
+    kinds = [boards[:, first + kind] for kind in range(6)]
+    return kinds, numpy.bitwise_or.reduce(boards[:, first:first + 6], axis=1)
+
+def _attacks(kinds, side, occupied):
+    """Squares attacked by the pieces of a side, given by kind"""
+    empty = ~occupied
+    steps = (_NW, _NE) if side == WHITE else (_SW, _SE)
+    attacks = _shift(kinds[PAWN], steps[0]) | _shift(kinds[PAWN], steps[1])
+    for step in _KNIGHT:
+        attacks |= _shift(kinds[KNIGHT], step)
+    for step in _KING:
+        attacks |= _shift(kinds[KING], step)
+    diagonal = kinds[BISHOP] | kinds[QUEEN]
+    orthogonal = kinds[ROOK] | kinds[QUEEN]
+    for steps, sliders in ((_DIAGONAL, diagonal), (_ORTHOGONAL, orthogonal)):
+        for step in steps:
+            attacks |= _slide(sliders, empty, step)
+    return attacks
+
+def _side_to_move(boards):
+    return numpy.where(boards[:, SIDE_TO_MOVE] != 0, BLACK, WHITE)
+
+def _by_side(boards, function):
+    """Results of function(boards, side) for a batch of positions of both sides to
+    move, each worked out on the positions of its side"""
+    sides = _side_to_move(boards)
+    result = None
+    for side in (WHITE, BLACK):
+        rows = numpy.flatnonzero(sides == side)
+        part = function(boards[rows], side)
+        if result is None:
+            result = numpy.empty(len(boards), part.dtype)
+        result[rows] = part
+    return result
+
+def _batch(positions):
+    _require_numpy()
+    if isinstance(positions, numpy.ndarray):
+        return positions.astype(numpy.uint64, copy=False).reshape(-1, PIECE_PLANES + 2)
+    return bitboard_array(positions)
+
+def attack_masks(positions):
+    """Array of shape (N, 2) of uint64 of the squares attacked by white and by black
+    in a batch of positions, given as an array of bitboards or a sequence of games,
+    views or snapshots"""
+    boards = _batch(positions)
+    occupied = numpy.bitwise_or.reduce(boards[:, :PIECE_PLANES], axis=1)
+    masks = numpy.empty((len(boards), 2), numpy.uint64)
+    for side in (WHITE, BLACK):
+        masks[:, side] = _attacks(_pieces(boards, side)[0], side, occupied)
+    return masks
+
+def _in_check(boards, side):
+    kinds, _ = _pieces(boards, side)
+    occupied = numpy.bitwise_or.reduce(boards[:, :PIECE_PLANES], axis=1)
+    enemy = _attacks(_pieces(boards, side ^ 1)[0], side ^ 1, occupied)
+    return (kinds[KING] & enemy) != 0
+
+def in_check(positions):
+    """Array of bools telling if the side to move is in check, for a batch of positions
+    given like to attack_masks()"""
+    return _by_side(_batch(positions), _in_check)
+
+def _king_attacked(king, side, occupied, enemy_kinds):
+    """If the king of side is attacked by the pieces given by kind, with the occupied
+    squares given"""
+    empty = ~occupied
+    pawn_steps = (_NW, _NE) if side == WHITE else (_SW, _SE)
+    attackers = (_shift(king, pawn_steps[0]) | _shift(king, pawn_steps[1])) & enemy_kinds[PAWN]
+    for step in _KNIGHT:
+        attackers |= _shift(king, step) & enemy_kinds[KNIGHT]
+    for step in _KING:
+        attackers |= _shift(king, step) & enemy_kinds[KING]
+    diagonal = enemy_kinds[BISHOP] | enemy_kinds[QUEEN]
+    orthogonal = enemy_kinds[ROOK] | enemy_kinds[QUEEN]
+    for steps, sliders in ((_DIAGONAL, diagonal), (_ORTHOGONAL, orthogonal)):
+        for step in steps:
+            attackers |= _slide(king, empty, step) & sliders
+    return attackers != 0
+
+def _legal_move_counts(boards, side):
+    kinds, own = _pieces(boards, side)
+    enemy_kinds, enemy = _pieces(boards, side ^ 1)
+    occupied = own | enemy
+    empty = ~occupied
+    king = kinds[KING]
+    diagonal = enemy_kinds[BISHOP] | enemy_kinds[QUEEN]
+    orthogonal = enemy_kinds[ROOK] | enemy_kinds[QUEEN]
+
+    # the pieces giving check, the squares blocking their lines, and the pieces pinned
+    # to the king along each of the 4 lines through it
+    pawn_steps = (_NW, _NE) if side == WHITE else (_SW, _SE)
+    checkers = (_shift(king, pawn_steps[0]) | _shift(king, pawn_steps[1])) & enemy_kinds[PAWN]
+    for step in _KNIGHT:
+        checkers |= _shift(king, step) & enemy_kinds[KNIGHT]
+    lines = _ZERO
+    pinned = [_ZERO] * 4
+    for steps, sliders in ((_DIAGONAL, diagonal), (_ORTHOGONAL, orthogonal)):
+        for step in steps:
+            ray = _slide(king, empty, step)
+            checking = ray & sliders
+            checkers |= checking
+            lines |= numpy.where(checking != 0, ray, _ZERO)
+            # look through the closest piece if it's one of ours
+            blocker = ray & own
+            pinning = _slide(king, empty | blocker, step) & sliders & ~ray
+            pinned[_AXIS[step]] |= numpy.where(pinning != 0, blocker, _ZERO)
+    all_pinned = pinned[0] | pinned[1] | pinned[2] | pinned[3]
+    checks = _count(checkers)
+    # the squares a piece other than the king can go to, to block or capture a single
+    # checking piece, or none at all when there are two
+    evasions = numpy.where(checks == 0, _FULL,
+                           numpy.where(checks == 1, checkers | lines, _ZERO))
+    targets = ~own & evasions
+
+    counts = numpy.zeros(len(boards), numpy.int64)
+    # a pinned piece can only move along the line of its pin
+    def free(pieces, step):
+        return pieces & (~all_pinned | pinned[_AXIS[step]])
+
+    for step in _KNIGHT:
+        counts += _count(_shift(kinds[KNIGHT] & ~all_pinned, step) & targets)
+    for steps, sliders in ((_DIAGONAL, kinds[BISHOP] | kinds[QUEEN]),
+                           (_ORTHOGONAL, kinds[ROOK] | kinds[QUEEN])):
+        for step in steps:
+            moving = free(sliders, step)
+            for _ in range(7):
+                moving = _shift(moving, step) & ~own
+                counts += _count(moving & evasions)
+                moving &= empty
+
+    forward, double = (_N, _RANK_4) if side == WHITE else (_S, _RANK_5)
+    pawns = kinds[PAWN]
+    one = _shift(free(pawns, forward), forward) & empty
+    two = _shift(one, forward) & empty & double
+    counts += _count(one & evasions) + _count(two & evasions)
+    for step in pawn_steps:
+        counts += _count(_shift(free(pawns, step), step) & enemy & evasions)
+
+    # en passant removes 2 pieces from the board, so it's tried on the bitboards as
+    # they'd be after the capture, at most 2 pawns being able to make it
+    en_passant = boards[:, EN_PASSANT] & (_RANK_6 if side == WHITE else _RANK_3)
+    captured = _shift(en_passant, _S if side == WHITE else _N)
+    remaining = list(enemy_kinds)
+    remaining[PAWN] = remaining[PAWN] & ~captured
+    for step in pawn_steps:
+        capturing = _shift(en_passant, _BACK[step]) & pawns
+        after = occupied ^ capturing ^ captured | en_passant
+        counts += (capturing != 0) & ~_king_attacked(king, side, after, remaining)
+
+    enemy_attacks = _attacks(enemy_kinds, side ^ 1, occupied ^ king)
+    for step in _KING:
+        counts += _count(_shift(king, step) & ~own & ~enemy_attacks)
+    return counts
+
+def legal_move_counts(positions):
+    """Array of the number of legal moves of the side to move, for a batch of positions
+    given like to attack_masks()"""
+    return _by_side(_batch(positions), _legal_move_counts)
@@ -0,0 +1,130 @@
+"""Bitboard primitives. A bitboard is an int with one bit per square, a1 being
+bit 0, b1 bit 1 and so on until h8, which is bit 63."""
+
+WHITE, BLACK = 0, 1
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+
+FULL = (1 << 64) - 1
+FILES = 'abcdefgh'
+RANKS = '12345678'
+SQUARE_NAMES = [f + r for r in RANKS for f in FILES]
+SQUARES = {name: i for i, name in enumerate(SQUARE_NAMES)}
+
+# (file, rank) steps
+ORTHOGONAL = ((0, 1), (1, 0), (0, -1), (-1, 0))
+DIAGONAL = ((1, 1), (1, -1), (-1, -1), (-1, 1))
+KNIGHT_STEPS = ((1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2))
+KING_STEPS = ORTHOGONAL + DIAGONAL
+
+def square_file(square):
+    """File of the square, 0 being the a-file"""
+    return square & 7
+
+def square_rank(square):
+    """Rank of the square, 0 being the first rank"""
+    return square >> 3
+
+def iter_bits(bitboard):
+    """Generate the indices of the squares set in the bitboard, lowest first"""
+    while bitboard:
+        lowest = bitboard & -bitboard
+        yield lowest.bit_length() - 1
+        bitboard ^= lowest
+
+def lowest_square(bitboard):
+    """Index of the lowest square set in a non-empty bitboard"""
+    return (bitboard & -bitboard).bit_length() - 1
+
+def popcount(bitboard):
+    """Number of squares set in the bitboard"""
+    return bin(bitboard).count('1')
+
+def _step(square, file_step, rank_step):
+    """Index of the square reached with one step, None if it's off the board"""
+    file, rank = square_file(square) + file_step, square_rank(square) + rank_step
+    if 0 <= file < 8 and 0 <= rank < 8:
+        return rank * 8 + file
+    return None
+
+def _steps(square, steps):
+    """Bitboard of the squares reached from `square` by taking exactly one of the steps"""
+    squares = 0
+    for file_step, rank_step in steps:
+        target = _step(square, file_step, rank_step)
+        if target is not None:
+            squares |= 1 << target
+    return squares
+
+def _ray(square, file_step, rank_step):
+    """Bitboard of the squares reached by repeating a step from `square`"""
+    squares = 0
+    target = _step(square, file_step, rank_step)
+    while target is not None:
+        squares |= 1 << target
+        target = _step(target, file_step, rank_step)
+    return squares
+
+# precomputed tables indexed by square
+KNIGHT_ATTACKS = [_steps(s, KNIGHT_STEPS) for s in range(64)]
+KING_ATTACKS = [_steps(s, KING_STEPS) for s in range(64)]
+PAWN_ATTACKS = (
+    [_steps(s, ((-1, 1), (1, 1))) for s in range(64)],   # white
+    [_steps(s, ((-1, -1), (1, -1))) for s in range(64)], # black
+)
+# rays in each direction, up to the edge of the board
+RAYS = {step: [_ray(s, *step) for s in range(64)] for step in ORTHOGONAL + DIAGONAL}
+# directions in which the square indices grow, the closest blocker being the lowest bit
+_ORTHOGONAL_UP = [RAYS[step] for step in ORTHOGONAL if step > (0, 0)]
+_ORTHOGONAL_DOWN = [RAYS[step] for step in ORTHOGONAL if step < (0, 0)]
+_DIAGONAL_UP = [RAYS[step] for step in DIAGONAL if step[1] > 0]
+_DIAGONAL_DOWN = [RAYS[step] for step in DIAGONAL if step[1] < 0]
+# squares a rook or a bishop reaches on an empty board
+ORTHOGONAL_LINES = [RAYS[(0, 1)][s] | RAYS[(1, 0)][s] | RAYS[(0, -1)][s] | RAYS[(-1, 0)][s]
+                    for s in range(64)]
+DIAGONAL_LINES = [RAYS[(1, 1)][s] | RAYS[(1, -1)][s] | RAYS[(-1, -1)][s] | RAYS[(-1, 1)][s]
+                  for s in range(64)]
+
+def _between_table():
+    table = [[0] * 64 for _ in range(64)]
+    for square in range(64):
+        for file_step, rank_step in ORTHOGONAL + DIAGONAL:
+            squares = 0
+            target = _step(square, file_step, rank_step)
+            while target is not None:
+                table[square][target] = squares
+                squares |= 1 << target
+                target = _step(target, file_step, rank_step)
+    return table
+
+# squares strictly between two squares sharing a line, BETWEEN[square1][square2]
+BETWEEN = _between_table()
+
+def _slide(square, occupied, rays_up, rays_down):
+    """Squares attacked along the rays, each ray stopping at its first occupied square"""
+    attacks = 0
+    for rays in rays_up:
+        ray = rays[square]
+        blocking = ray & occupied
+        if blocking:
+            ray ^= rays[(blocking & -blocking).bit_length() - 1]
+        attacks |= ray
+    for rays in rays_down:
+        ray = rays[square]
+        blocking = ray & occupied
+        if blocking:
+            ray ^= rays[blocking.bit_length() - 1]
+        attacks |= ray
+    return attacks
+
+def rook_attacks(square, occupied):
+    """Squares attacked by a rook on `square` given the occupied squares"""
+    return _slide(square, occupied, _ORTHOGONAL_UP, _ORTHOGONAL_DOWN)
+
+def bishop_attacks(square, occupied):
+    """Squares attacked by a bishop on `square` given the occupied squares"""
+    return _slide(square, occupied, _DIAGONAL_UP, _DIAGONAL_DOWN)
+
+def queen_attacks(square, occupied):
+    """Squares attacked by a queen on `square` given the occupied squares"""
+    return (_slide(square, occupied, _ORTHOGONAL_UP, _ORTHOGONAL_DOWN) |
+            _slide(square, occupied, _DIAGONAL_UP, _DIAGONAL_DOWN))
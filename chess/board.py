@@ -1,41 +1,76 @@
 """A board where the game of chess is played"""
 from itertools import chain
-from .colors import BG1, BG2, RESET_STYLE
-from .helpers import alg2grid, grid2alg, char_range, is_position
-from .exceptions import IllegalMove
+from .colors import BG1, BG2, RESET_STYLE, side_of
+from .helpers import char_range
+from .bitboard import (
+    PAWN,
+    KNIGHT,
+    BISHOP,
+    ROOK,
+    QUEEN,
+    KING,
+    SQUARES,
+    SQUARE_NAMES,
+    KNIGHT_ATTACKS,
+    KING_ATTACKS,
+    PAWN_ATTACKS,
+    BETWEEN,
+    iter_bits,
+    rook_attacks,
+    bishop_attacks,
+    queen_attacks,
+)
+from .attacks import AttackMap
+from .zobrist import PIECE_KEYS
+from .evaluation import PIECE_SCORES
 
 class Board(object):
     """The chessboard"""
+    __slots__ = ('game', 'grid')
+
     def __init__(self, game):
         self.game = game
         self.grid = Grid(game)
 
     def move(self, piece, position):
-        """Check if the move is valid and move a piece to a position. If the
-        position was already occupied by the opponent, return the captured piece."""
-        if not is_position(position):
-            raise IllegalMove(f"'{position}' doesn't look like a valid position")
-        target_square = self[position]
-        if target_square.piece and target_square.piece.color == piece.color:
-            raise IllegalMove(f"{position} is already occupied by you")
-
-        captured = piece.move(position)
-        return captured
+        """Check if the move is valid and move a piece to a position with
+        Chess.move(). If the position was already occupied by the opponent, return the
+        captured piece."""
+        return self.game.move(piece, position)
 
     def update_piece_positions(self):
         """Called in game init after the pieces are placed"""
         self.grid.update_piece_positions()
 
+    def occupancy(self, color=None):
+        """Bitboard of the squares occupied by color, or by anyone if color is None"""
+        if color is None:
+            return self.grid.occupied
+        return self.grid.colors[side_of(color)]
+
+    def attackers(self, position, color):
+        """Positions of color's pieces that attack position"""
+        attackers = self.grid.attack_map.attackers_of(SQUARES[position], side_of(color))
+        return [SQUARE_NAMES[s] for s in iter_bits(attackers)]
+
+    def attacks(self, position):
+        """Positions attacked by the piece at position"""
+        return [SQUARE_NAMES[s] for s in iter_bits(self.grid.attacks(SQUARES[position]))]
+
+    def is_path_clear(self, position1, position2):
+        """Check if there are no pieces between two positions on the same line"""
+        return not BETWEEN[SQUARES[position1]][SQUARES[position2]] & self.grid.occupied
+
     def __str__(self):
         files_text = [f' {c} ' for c in chain(' ', char_range('a', 'h'), ' ')]
         files_text = ''.join(files_text)
         output_rows = [files_text]
-        for rank in char_range('8', '1'):
-            row = [f' {rank} ']
-            for file in char_range('a', 'h'):
-                square = self[f'{file}{rank}']
+        for rank in range(7, -1, -1):
+            row = [f' {rank + 1} ']
+            for file in range(8):
+                square = Square(self.grid, rank * 8 + file)
                 row.append(f'{square}{RESET_STYLE}')
-            row.append(f' {rank} ')
+            row.append(f' {rank + 1} ')
             output_rows.append(row)
         output_rows.append(files_text)
 
@@ -52,11 +87,32 @@ class Board(object):
 
 
 class Square(object):
-    """A chessboard square"""
-    def __init__(self, rank, file):
-        self.rank = rank
-        self.file = file
-        self.piece = None
+    """A chessboard square. It's a view to the grid, so setting `piece` places the
+    piece on the grid."""
+    __slots__ = ('grid', 'index')
+
+    def __init__(self, grid, index):
+        self.grid = grid
+        self.index = index
+
+    @property
+    def piece(self):
+        """The piece on this square"""
+        return self.grid.pieces[self.index]
+
+    @piece.setter
+    def piece(self, piece):
+        self.grid.put(self.index, piece)
+
+    @property
+    def rank(self):
+        """Grid column, (0, 0) being a8"""
+        return self.index & 7
+
+    @property
+    def file(self):
+        """Grid row, (0, 0) being a8"""
+        return 7 - (self.index >> 3)
 
     def __str__(self):
         bgcolor = BG1 if self.rank % 2 == self.file % 2 else BG2
@@ -66,33 +122,156 @@ class Square(object):
         return f'<Square ({self.rank}, {self.file}): {self.piece}>'
 
 class Grid(object):
-    """An 8x8 grid containing the chessboard squares"""
+    """The 64 chessboard squares. The pieces are kept in a list indexed by square
+    (a1 is 0, h8 is 63) and their placement is mirrored in bitboards by color and
+    by kind of piece, so that occupancy and attacks can be computed with integer
+    operations."""
+    __slots__ = ('game', 'pieces', 'colors', 'kinds', 'occupied', 'key', 'pawn_key', 'score',
+                 'attack_map')
+
     def __init__(self, game):
         self.game = game
-        # (0, 0) is a8
-        self.squares = [[Square(x, y) for x in range(8)] for y in range(8)]
+        self.pieces = [None] * 64
+        self.colors = [0, 0]
+        self.kinds = [0] * 6
+        self.occupied = 0
+        self.key = 0 # Zobrist hash of the placement of the pieces
+        self.pawn_key = 0 # the same of the pawns only
+        self.score = 0 # evaluation of the placement for white, see chess.evaluation
+        self.attack_map = AttackMap(self)
+
+    @property
+    def squares(self):
+        """The squares as 8 rows of 8, (0, 0) being a8"""
+        return [[Square(self, (7 - y) * 8 + x) for x in range(8)] for y in range(8)]
+
+    def put(self, square, piece):
+        """Place piece on the square with index `square`, replacing whatever was there.
+        `None` empties the square."""
+        self.remove(square)
+        if piece:
+            mask = 1 << square
+            self.pieces[square] = piece
+            self.colors[piece.side] |= mask
+            self.kinds[piece.kind] |= mask
+            self.occupied |= mask
+            self.key ^= PIECE_KEYS[piece.side][piece.kind][square]
+            if piece.kind == PAWN:
+                self.pawn_key ^= PIECE_KEYS[piece.side][PAWN][square]
+            self.score += PIECE_SCORES[piece.side][piece.kind][square]
+            self.attack_map.dirty |= mask
+
+    def load(self, pieces):
+        """Replace the placement with a list of 64 pieces or None, a1 first, computing
+        the bitboards, the hashes and the evaluation in one pass"""
+        colors, kinds, key, pawn_key, score = [0, 0], [0] * 6, 0, 0, 0
+        for square, piece in enumerate(pieces):
+            if piece:
+                mask = 1 << square
+                colors[piece.side] |= mask
+                kinds[piece.kind] |= mask
+                key ^= PIECE_KEYS[piece.side][piece.kind][square]
+                if piece.kind == PAWN:
+                    pawn_key ^= PIECE_KEYS[piece.side][PAWN][square]
+                score += PIECE_SCORES[piece.side][piece.kind][square]
+        self.pieces = list(pieces)
+        self.colors = colors
+        self.kinds = kinds
+        self.occupied = colors[0] | colors[1]
+        self.key = key
+        self.pawn_key = pawn_key
+        self.score = score
+        self.attack_map = AttackMap(self)
+        self.attack_map.dirty = self.occupied
+
+    def copy_from(self, grid):
+        """Replace the placement with the one of another grid, with new pieces of the
+        same kinds and colors. The bitboards, the hashes and the evaluation are ints
+        shared with the other grid, and its attack map is copied rather than computed
+        again."""
+        self.pieces = [piece and type(piece)(piece.color) for piece in grid.pieces]
+        self.colors = list(grid.colors)
+        self.kinds = list(grid.kinds)
+        self.occupied = grid.occupied
+        self.key = grid.key
+        self.pawn_key = grid.pawn_key
+        self.score = grid.score
+        attack_map = AttackMap(self)
+        attack_map.attacks = list(grid.attack_map.attacks)
+        attack_map.attackers = list(grid.attack_map.attackers)
+        attack_map.dirty = grid.attack_map.dirty
+        self.attack_map = attack_map
+
+    def remove(self, square):
+        """Empty the square with index `square` and return the piece that was there"""
+        piece = self.pieces[square]
+        if piece:
+            mask = ~(1 << square)
+            self.pieces[square] = None
+            self.colors[piece.side] &= mask
+            self.kinds[piece.kind] &= mask
+            self.occupied &= mask
+            self.key ^= PIECE_KEYS[piece.side][piece.kind][square]
+            if piece.kind == PAWN:
+                self.pawn_key ^= PIECE_KEYS[piece.side][PAWN][square]
+            self.score -= PIECE_SCORES[piece.side][piece.kind][square]
+            self.attack_map.dirty |= 1 << square
+        return piece
+
+    def attackers(self, square, side, occupied=None):
+        """Bitboard of side's pieces attacking the square. The occupancy used for
+        sliding pieces can be overridden with `occupied`."""
+        if occupied is None:
+            occupied = self.occupied
+        kinds = self.kinds
+        diagonal = kinds[BISHOP] | kinds[QUEEN]
+        orthogonal = kinds[ROOK] | kinds[QUEEN]
+        return self.colors[side] & (
+            (KNIGHT_ATTACKS[square] & kinds[KNIGHT]) |
+            (KING_ATTACKS[square] & kinds[KING]) |
+            (PAWN_ATTACKS[side ^ 1][square] & kinds[PAWN]) |
+            (bishop_attacks(square, occupied) & diagonal) |
+            (rook_attacks(square, occupied) & orthogonal)
+        )
+
+    def attacks(self, square):
+        """Bitboard of the squares attacked by the piece on the square"""
+        piece = self.pieces[square]
+        if not piece:
+            return 0
+        kind = piece.kind
+        if kind == PAWN:
+            return PAWN_ATTACKS[piece.side][square]
+        if kind == KNIGHT:
+            return KNIGHT_ATTACKS[square]
+        if kind == BISHOP:
+            return bishop_attacks(square, self.occupied)
+        if kind == ROOK:
+            return rook_attacks(square, self.occupied)
+        if kind == QUEEN:
+            return queen_attacks(square, self.occupied)
+        return KING_ATTACKS[square]
 
     def update_piece_positions(self):
         """Give pieces ID's, a reference to the game instance (and vice versa) and
         let them know where they are positioned."""
         piece_id = 0
-        for i, row in enumerate(self.squares):
-            for j, square in enumerate(row):
-                if square.piece:
-                    square.piece.game = self.game
-                    square.piece.position = ''.join(grid2alg(j, i))
-                    square.piece.piece_id = piece_id
-                    self.game.pieces[piece_id] = square.piece
+        for rank in range(7, -1, -1):
+            for square in range(rank * 8, rank * 8 + 8):
+                piece = self.pieces[square]
+                if piece:
+                    piece.game = self.game
+                    piece.square = square
+                    piece.piece_id = piece_id
+                    self.game.pieces[piece_id] = piece
                     piece_id += 1
 
     def __getitem__(self, position):
-        if not is_position(position):
+        if position not in SQUARES:
             raise KeyError(position)
-        grid_x, grid_y = alg2grid(position) # pylint: disable=unbalanced-tuple-unpacking
-        return self.squares[grid_y][grid_x]
+        return Square(self, SQUARES[position])
 
     def __setitem__(self, position, item):
-        if not is_position(position):
+        if position not in SQUARES:
             raise KeyError(position)
-        grid_x, grid_y = alg2grid(position) # pylint: disable=unbalanced-tuple-unpacking
-        self.squares[grid_y][grid_x] = item
+        self.put(SQUARES[position], item.piece)
@@ -1,9 +1,15 @@
 """Piece and terminal colors"""
 from enum import Enum
 import colorama
+from .bitboard import WHITE, BLACK
 
 COLOR = Enum('COLOR', ('white', 'black'))
 
+def side_of(color):
+    """The side of a color as used by the bitboards, WHITE or BLACK. Anything but
+    COLOR.black, like the turn of a game that hasn't started, is white."""
+    return BLACK if color == COLOR.black else WHITE
+
 BG1 = colorama.Back.WHITE
 BG2 = colorama.Back.LIGHTBLACK_EX
 FG_WHITE = colorama.Fore.LIGHTWHITE_EX
@@ -0,0 +1,5 @@
+"""A computer opponent searching for the best move"""
+
+from .transposition import TranspositionTable
+from .search import Engine, SearchResult, material
+from .parallel import ParallelEngine, worker_engine
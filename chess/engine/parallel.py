@@ -0,0 +1,84 @@
+"""Search split across worker processes"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from ..game import Chess
+from .search import Engine
+
+# the engine of a worker process, kept between searches for its transposition table
+_engine = None
+
+def worker_engine(table_size=1 << 16):
+    """The Engine of the current worker process, with a transposition table of at
+    least `table_size` slots, made the first time it's needed and then kept"""
+    global _engine # pylint: disable=global-statement
+    if _engine is None or len(_engine.table.slots) < table_size:
+        _engine = Engine(table_size)
+    return _engine
+
+def _search_moves(snapshot, moves, depth, time_limit, table_size):
+    """Search some of the root moves in a worker process. Return the results of
+    the completed iterations and the number of nodes searched."""
+    engine = worker_engine(table_size)
+    result = engine.search(Chess(snapshot), depth=depth, time_limit=time_limit, moves=moves)
+    return engine.iterations, result.nodes
+
+def merge_shares(results):
+    """The best move of the shares of the root moves, given as the iterations each share
+    completed and the number of nodes it searched, as a SearchResult counting the nodes
+    of all shares, or None if no share completed an iteration"""
+    nodes = sum(share_nodes for _, share_nodes in results)
+    # each share at the deepest iteration it completed, a share stopping early because
+    # it found a mate being as good as final
+    finished = [iterations[-1] for iterations, _ in results if iterations]
+    if not finished:
+        return None
+    best = max(finished, key=lambda result: result.score)
+    return best._replace(nodes=nodes)
+
+class ParallelEngine(object):
+    """Splits the root moves of the position among worker processes, each searching
+    its share with iterative deepening. The workers get a snapshot of the position
+    rather than the game. The best move is the best of the deepest iterations the
+    shares completed, and its depth the depth of that iteration. Shares that didn't
+    finish an iteration in time are left out."""
+    def __init__(self, workers=None, table_size=1 << 16):
+        self.workers = workers or os.cpu_count() or 1
+        self.table_size = table_size
+        self.executor = ProcessPoolExecutor(self.workers)
+
+    def search(self, game, depth=64, time_limit=None):
+        """Search the position of the game for the side whose turn it is, until `depth`
+        or the `time_limit` in seconds, and return a SearchResult"""
+        started = time.perf_counter()
+        moves = game.legal_moves()
+        if len(moves) < 2:
+            # nothing to split
+            return Engine(self.table_size).search(game, depth=depth, time_limit=time_limit)
+
+        # captures first, dealt round robin so that each share gets some of them
+        moves.sort(key=lambda move: game.board[move[1]].piece is None)
+        shares = [moves[i::self.workers] for i in range(min(self.workers, len(moves)))]
+        snapshot = game.snapshot()
+        futures = [self.executor.submit(_search_moves, snapshot, share, depth, time_limit,
+                                        self.table_size)
+                   for share in shares]
+        # give the workers a moment to return after their deadline
+        timeout = None if time_limit is None else time_limit + 1 + time_limit / 10
+        done, not_done = wait(futures, timeout=timeout)
+        for future in not_done:
+            future.cancel()
+        best = merge_shares([future.result() for future in done])
+        if best is None:
+            return Engine(self.table_size).search(game, depth=1)
+        return best._replace(time=time.perf_counter() - started)
+
+    def close(self):
+        """Shut down the worker processes"""
+        self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
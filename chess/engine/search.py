@@ -0,0 +1,303 @@
+"""Alpha-beta search for the best move"""
+import time
+from collections import namedtuple
+from ..bitboard import (
+    PAWN,
+    KNIGHT,
+    BISHOP,
+    ROOK,
+    QUEEN,
+    SQUARES,
+    SQUARE_NAMES,
+    popcount,
+)
+from ..colors import side_of
+from ..evaluation import PIECE_VALUES
+from ..movegen import legal_moves, king_attackers, en_passant_square
+from .transposition import TranspositionTable, EXACT, LOWER, UPPER
+
+INFINITY = 1 << 20
+MATE = 100000 # minus the number of plies to the mate
+MAX_PLY = 128
+
+SearchResult = namedtuple('SearchResult', ('move', 'score', 'depth', 'nodes', 'time', 'pv'))
+SearchResult.__doc__ = """The best move as a (from, to) pair of positions, its score in
+centipawns from the point of view of the side to move, the depth of the last completed
+iteration, the number of nodes searched, the time spent and the principal variation"""
+
+class SearchTimeout(Exception):
+    """The deadline of the search passed"""
+
+def material(game, side):
+    """Material balance in centipawns from the point of view of side"""
+    grid = game.board.grid
+    own, other = grid.colors[side], grid.colors[side ^ 1]
+    score = 0
+    for kind in (PAWN, KNIGHT, BISHOP, ROOK, QUEEN):
+        pieces = grid.kinds[kind]
+        score += PIECE_VALUES[kind] * (popcount(pieces & own) - popcount(pieces & other))
+    return score
+
+class Engine(object):
+    """Negamax alpha-beta search with iterative deepening, a transposition table and
+    quiescence search. Moves are tried in the order: the move from the transposition
+    table, captures by most valuable victim and least valuable attacker, killer moves
+    and quiet moves by history score.
+
+    The search pushes and pops moves on the game it's given, leaving the game as it
+    was when it returns."""
+    def __init__(self, table_size=1 << 16, evaluate=material):
+        self.table = TranspositionTable(table_size)
+        self.evaluate = evaluate
+        self.game = None
+        self.nodes = 0
+        self.deadline = None
+        self.node_limit = None
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        self.history = [[0] * 4096, [0] * 4096]
+        self.iterations = []
+        self._path = []
+
+    def search(self, game, depth=64, time_limit=None, node_limit=None, moves=None):
+        """Search the position of the game for the side whose turn it is, iteratively
+        deepening until `depth`, the `time_limit` in seconds or the `node_limit` is
+        reached, and return a SearchResult of the last completed iteration. The search
+        can be limited to some of the moves, given as (from, to) pairs of positions.
+
+        The result of each completed iteration is kept in `iterations`."""
+        started = time.perf_counter()
+        self.game = game
+        self.nodes = 0
+        self.deadline = started + time_limit if time_limit is not None else None
+        self.node_limit = node_limit
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        self.history = [[0] * 4096, [0] * 4096]
+        self.iterations = []
+        self.table.new_search()
+        side = side_of(game.turn)
+
+        root_moves = list(legal_moves(game, side))
+        if moves is not None:
+            moves = {(SQUARES[move_from], SQUARES[move_to]) for move_from, move_to in moves}
+            root_moves = [move for move in root_moves if move in moves]
+        if not root_moves:
+            score = -MATE if king_attackers(game, side) else 0
+            return SearchResult(None, score, 0, 0, time.perf_counter() - started, [])
+
+        best_move = root_moves[0]
+        for iteration in range(1, min(depth, MAX_PLY - 1) + 1):
+            try:
+                best_score, best_move = self._root(root_moves, iteration, side)
+            except SearchTimeout:
+                break
+            self.iterations.append(SearchResult(
+                (SQUARE_NAMES[best_move[0]], SQUARE_NAMES[best_move[1]]),
+                best_score,
+                iteration,
+                self.nodes,
+                time.perf_counter() - started,
+                self._principal_variation(best_move, iteration),
+            ))
+            # search the best move first on the next iteration
+            root_moves.remove(best_move)
+            root_moves.insert(0, best_move)
+            if abs(best_score) >= MATE - MAX_PLY:
+                break
+
+        if self.iterations:
+            return self.iterations[-1]._replace(
+                nodes=self.nodes, time=time.perf_counter() - started)
+        # not even the first iteration was completed
+        return SearchResult((SQUARE_NAMES[best_move[0]], SQUARE_NAMES[best_move[1]]),
+                            0, 0, self.nodes, time.perf_counter() - started, [])
+
+    def _root(self, moves, depth, side):
+        game = self.game
+        self._path = [game.position_key()]
+        alpha, best_move = -INFINITY, moves[0]
+        for move in moves:
+            game.push(move)
+            try:
+                score = -self._negamax(depth - 1, -INFINITY, -alpha, 1, side ^ 1)
+            finally:
+                game.pop()
+            if score > alpha:
+                alpha, best_move = score, move
+        return alpha, best_move
+
+    def _negamax(self, depth, alpha, beta, ply, side):
+        game = self.game
+        self.nodes += 1
+        if not self.nodes & 1023:
+            self._check_limits()
+
+        key = game.position_key()
+        if key in self._path:
+            return 0 # repetition
+        in_check = king_attackers(game, side)
+        if in_check:
+            depth += 1
+        if depth <= 0 or ply >= MAX_PLY - 1:
+            return self._quiescence(alpha, beta, ply, side)
+
+        original_alpha = alpha
+        tt_move = None
+        entry = self.table.get(key)
+        if entry is not None:
+            entry_depth, score, bound, tt_move = entry
+            if entry_depth >= depth:
+                score = _score_from_table(score, ply)
+                if (bound == EXACT or (bound == LOWER and score >= beta) or
+                        (bound == UPPER and score <= alpha)):
+                    return score
+
+        moves = list(legal_moves(game, side))
+        if not moves:
+            return -MATE + ply if in_check else 0
+        self._order(moves, tt_move, ply, side)
+
+        self._path.append(key)
+        best_score, best_move = -INFINITY, None
+        for move in moves:
+            game.push(move)
+            try:
+                score = -self._negamax(depth - 1, -beta, -alpha, ply + 1, side ^ 1)
+            finally:
+                game.pop()
+            if score > best_score:
+                best_score, best_move = score, move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        self._remember_cutoff(move, depth, ply, side)
+                        break
+        self._path.pop()
+
+        if best_score <= original_alpha:
+            bound = UPPER
+        elif best_score >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.table.store(key, depth, _score_to_table(best_score, ply), bound, best_move)
+        return best_score
+
+    def _quiescence(self, alpha, beta, ply, side):
+        """Search captures only, until the position is quiet"""
+        game = self.game
+        self.nodes += 1
+        if not self.nodes & 1023:
+            self._check_limits()
+
+        in_check = king_attackers(game, side)
+        if in_check:
+            # every move has to be considered to get out of check
+            moves = list(legal_moves(game, side))
+            if not moves:
+                return -MATE + ply
+        else:
+            stand_pat = self.evaluate(game, side)
+            if stand_pat >= beta or ply >= MAX_PLY - 1:
+                return stand_pat
+            if stand_pat > alpha:
+                alpha = stand_pat
+            capturable = game.board.grid.colors[side ^ 1]
+            en_passant = en_passant_square(game, side)
+            if en_passant is not None:
+                capturable |= 1 << en_passant
+            moves = list(legal_moves(game, side, target_squares=capturable))
+        self._order(moves, None, ply, side)
+
+        for move in moves:
+            game.push(move)
+            try:
+                score = -self._quiescence(-beta, -alpha, ply + 1, side ^ 1)
+            finally:
+                game.pop()
+            if score > alpha:
+                alpha = score
+                if alpha >= beta:
+                    break
+        return alpha
+
+    def _order(self, moves, tt_move, ply, side):
+        """Sort moves so that the ones most likely to cause a cutoff come first"""
+        pieces = self.game.board.grid.pieces
+        killers = self.killers[ply]
+        history = self.history[side]
+
+        def score(move):
+            if move == tt_move:
+                return 1 << 30
+            square, target = move
+            victim = pieces[target]
+            attacker = pieces[square]
+            if victim is not None:
+                # most valuable victim, least valuable attacker
+                return (1 << 28) + victim.kind * 8 - attacker.kind
+            if attacker.kind == PAWN and square & 7 != target & 7:
+                return (1 << 28) + PAWN * 8 - PAWN # en passant
+            if move == killers[0] or move == killers[1]:
+                return 1 << 27
+            return history[square * 64 + target]
+
+        moves.sort(key=score, reverse=True)
+
+    def _remember_cutoff(self, move, depth, ply, side):
+        """Killer and history heuristics for quiet moves causing a beta cutoff"""
+        square, target = move
+        pieces = self.game.board.grid.pieces
+        if pieces[target] is not None:
+            return
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        self.history[side][square * 64 + target] += depth * depth
+
+    def _check_limits(self):
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            raise SearchTimeout()
+        if self.node_limit is not None and self.nodes >= self.node_limit:
+            raise SearchTimeout()
+
+    def _principal_variation(self, best_move, depth):
+        """Follow the best moves stored in the transposition table"""
+        game = self.game
+        pv = [best_move]
+        game.push(best_move)
+        keys = {game.position_key()}
+        pushed = 1
+        while len(pv) < max(depth, 1):
+            entry = self.table.get(game.position_key())
+            if entry is None or entry[3] is None:
+                break
+            move = entry[3]
+            side = side_of(game.turn)
+            if move not in legal_moves(game, side, 1 << move[0], 1 << move[1]):
+                break
+            game.push(move)
+            pushed += 1
+            key = game.position_key()
+            if key in keys:
+                break
+            keys.add(key)
+            pv.append(move)
+        for _ in range(pushed):
+            game.pop()
+        return [(SQUARE_NAMES[square], SQUARE_NAMES[target]) for square, target in pv]
+
+def _score_to_table(score, ply):
+    """Mate scores are stored relative to the position rather than to the root"""
+    if score >= MATE - MAX_PLY:
+        return score + ply
+    if score <= -MATE + MAX_PLY:
+        return score - ply
+    return score
+
+def _score_from_table(score, ply):
+    if score >= MATE - MAX_PLY:
+        return score - ply
+    if score <= -MATE + MAX_PLY:
+        return score + ply
+    return score
@@ -0,0 +1,32 @@
+"""A bounded transposition table"""
+from ..table import SlotTable
+
+# how the stored score bounds the real score
+EXACT, LOWER, UPPER = range(3)
+
+class TranspositionTable(SlotTable):
+    """Search results by position key in a fixed number of slots. A slot holding a
+    result of the current search is only replaced by a result of the same position or
+    one searched at least as deep. Results of earlier searches are always replaced."""
+    def __init__(self, size=1 << 16):
+        SlotTable.__init__(self, size)
+        self.generation = 0
+
+    def new_search(self):
+        """Age the stored results, so that the next search may replace them"""
+        self.generation += 1
+
+    def get(self, key):
+        """Return (depth, score, bound, move) stored for the key, or None"""
+        entry = self.entry(key)
+        if entry is not None:
+            return entry[1:5]
+        return None
+
+    def store(self, key, depth, score, bound, move):
+        """Store a search result, if the replacement policy allows it"""
+        index = key & self.mask
+        entry = self.slots[index]
+        if (entry is None or entry[0] == key or entry[5] != self.generation or
+                depth >= entry[1]):
+            self.slots[index] = (key, depth, score, bound, move, self.generation)
@@ -0,0 +1,211 @@
+"""Static evaluation with material and piece-square tables.
+
+Each piece is worth its material value plus a bonus or a penalty for the square it's
+on. The grid adds up the worth of the pieces as they're put on and removed from the
+squares, like it does with the Zobrist key, so the evaluation of the position is kept
+up to date by every move, capture, promotion and take back and evaluate() doesn't
+have to look at the board:
+
+    engine = Engine(evaluate=evaluate)
+    bar = evaluate(game) # centipawns, positive when white is better
+
+The tables are the ones of Tomasz Michniewski's simplified evaluation function.
+
+An Evaluator adds the pawn structure: doubled, isolated and passed pawns. It only
+changes when a pawn moves, is captured or is promoted, and most positions of a game or
+a search share it with many others, so it's worked out once for each placement of the
+pawns and kept in a PawnTable by Grid.pawn_key, a Zobrist key of the pawns only:
+
+    evaluator = Evaluator()
+    engine = Engine(evaluate=evaluator)
+    bar = evaluator(game)
+    evaluator.pawns.hit_rate"""
+from .bitboard import (
+    WHITE,
+    BLACK,
+    PAWN,
+    KNIGHT,
+    BISHOP,
+    ROOK,
+    QUEEN,
+    KING,
+    FULL,
+    RAYS,
+    iter_bits,
+    popcount,
+)
+from .table import SlotTable
+
+PIECE_VALUES = {PAWN: 100, KNIGHT: 320, BISHOP: 330, ROOK: 500, QUEEN: 900, KING: 0}
+
+# bonuses for white, from a8 to h1 as the board is printed
+_TABLES = {
+    PAWN: (
+        0, 0, 0, 0, 0, 0, 0, 0,
+        50, 50, 50, 50, 50, 50, 50, 50,
+        10, 10, 20, 30, 30, 20, 10, 10,
+        5, 5, 10, 25, 25, 10, 5, 5,
+        0, 0, 0, 20, 20, 0, 0, 0,
+        5, -5, -10, 0, 0, -10, -5, 5,
+        5, 10, 10, -20, -20, 10, 10, 5,
+        0, 0, 0, 0, 0, 0, 0, 0,
+    ),
+    KNIGHT: (
+        -50, -40, -30, -30, -30, -30, -40, -50,
+        -40, -20, 0, 0, 0, 0, -20, -40,
+        -30, 0, 10, 15, 15, 10, 0, -30,
+        -30, 5, 15, 20, 20, 15, 5, -30,
+        -30, 0, 15, 20, 20, 15, 0, -30,
+        -30, 5, 10, 15, 15, 10, 5, -30,
+        -40, -20, 0, 5, 5, 0, -20, -40,
+        -50, -40, -30, -30, -30, -30, -40, -50,
+    ),
+    BISHOP: (
+        -20, -10, -10, -10, -10, -10, -10, -20,
+        -10, 0, 0, 0, 0, 0, 0, -10,
+        -10, 0, 5, 10, 10, 5, 0, -10,
+        -10, 5, 5, 10, 10, 5, 5, -10,
+        -10, 0, 10, 10, 10, 10, 0, -10,
+        -10, 10, 10, 10, 10, 10, 10, -10,
+        -10, 5, 0, 0, 0, 0, 5, -10,
+        -20, -10, -10, -10, -10, -10, -10, -20,
+    ),
+    ROOK: (
+        0, 0, 0, 0, 0, 0, 0, 0,
+        5, 10, 10, 10, 10, 10, 10, 5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        0, 0, 0, 5, 5, 0, 0, 0,
+    ),
+    QUEEN: (
+        -20, -10, -10, -5, -5, -10, -10, -20,
+        -10, 0, 0, 0, 0, 0, 0, -10,
+        -10, 0, 5, 5, 5, 5, 0, -10,
+        -5, 0, 5, 5, 5, 5, 0, -5,
+        0, 0, 5, 5, 5, 5, 0, -5,
+        -10, 5, 5, 5, 5, 5, 0, -10,
+        -10, 0, 5, 0, 0, 0, 0, -10,
+        -20, -10, -10, -5, -5, -10, -10, -20,
+    ),
+    KING: (
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -20, -30, -30, -40, -40, -30, -30, -20,
+        -10, -20, -20, -20, -20, -20, -20, -10,
+        20, 20, 0, 0, 0, 0, 20, 20,
+        20, 30, 10, 0, 0, 10, 30, 20,
+    ),
+}
+
+# PIECE_SCORES[side][kind][square], the worth of a piece on a square from white's point
+# of view, the tables being flipped for black
+PIECE_SCORES = [[[PIECE_VALUES[kind] + _TABLES[kind][square ^ 56] for square in range(64)]
+                 for kind in range(6)]]
+PIECE_SCORES.append([[-PIECE_VALUES[kind] - _TABLES[kind][square] for square in range(64)]
+                     for kind in range(6)])
+
+def evaluate(game, side=WHITE):
+    """Evaluation of the position in centipawns from the point of view of side, white
+    by default. It can be given to an Engine as its evaluation function."""
+    score = game.board.grid.score
+    return score if side == WHITE else -score
+
+def score_pieces(pieces):
+    """Evaluation from white's point of view of a list of 64 pieces or None, a1 first,
+    adding up the worth of every piece"""
+    return sum(PIECE_SCORES[piece.side][piece.kind][square]
+               for square, piece in enumerate(pieces) if piece)
+
+DOUBLED_PAWN = -10 # for each pawn on a file after the first
+ISOLATED_PAWN = -15
+# by rank from the side of the pawn's color
+PASSED_PAWN = (0, 5, 10, 20, 35, 60, 100, 0)
+
+FILE_MASKS = [0x0101010101010101 << file for file in range(8)]
+# the files next to each file
+ADJACENT_FILES = [(FILE_MASKS[file - 1] if file > 0 else 0) |
+                  (FILE_MASKS[file + 1] if file < 7 else 0) for file in range(8)]
+
+def _passed_span(square, forward):
+    ahead = RAYS[forward][square]
+    return ahead | (ahead << 1 & FULL & ~FILE_MASKS[0]) | (ahead >> 1 & ~FILE_MASKS[7])
+
+# PASSED_SPANS[side][square], the squares in front of a pawn on its file and the files
+# next to it, where no opponent's pawn may be for it to be passed
+PASSED_SPANS = ([_passed_span(square, (0, 1)) for square in range(64)],
+                [_passed_span(square, (0, -1)) for square in range(64)])
+
+def pawn_structure(white_pawns, black_pawns):
+    """Evaluation from white's point of view of the pawn structure given by the
+    bitboards of the pawns, and a bitboard of the passed pawns of both colors"""
+    score, passed = 0, 0
+    for side, own, other, sign in ((WHITE, white_pawns, black_pawns, 1),
+                                   (BLACK, black_pawns, white_pawns, -1)):
+        for file in range(8):
+            count = popcount(own & FILE_MASKS[file])
+            if count > 1:
+                score += sign * DOUBLED_PAWN * (count - 1)
+            if count and not own & ADJACENT_FILES[file]:
+                score += sign * ISOLATED_PAWN * count
+        for square in iter_bits(own):
+            if not PASSED_SPANS[side][square] & other:
+                passed |= 1 << square
+                rank = square >> 3 if side == WHITE else 7 - (square >> 3)
+                score += sign * PASSED_PAWN[rank]
+    return score, passed
+
+class PawnTable(SlotTable):
+    """Pawn structure evaluations and passed pawns by pawn key in a fixed number of
+    slots. A new entry always replaces the one in its slot. The lookups are counted to
+    tell how well the table works."""
+    def __init__(self, size=1 << 14):
+        SlotTable.__init__(self, size)
+        self.hits = 0
+        self.misses = 0
+
+    def probe(self, grid):
+        """Return (score, passed) for the pawns of the grid, worked out and stored if
+        they aren't in the table"""
+        key = grid.pawn_key
+        entry = self.entry(key)
+        if entry is not None:
+            self.hits += 1
+            return entry[1:]
+        self.misses += 1
+        kinds, colors = grid.kinds, grid.colors
+        score, passed = pawn_structure(kinds[PAWN] & colors[WHITE], kinds[PAWN] & colors[BLACK])
+        self.put((key, score, passed))
+        return score, passed
+
+    @property
+    def hit_rate(self):
+        """Fraction of the lookups found in the table, 0 before the first one"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self):
+        """Forget all entries and statistics"""
+        SlotTable.clear(self)
+        self.hits = self.misses = 0
+
+class Evaluator(object):
+    """An evaluation function adding the pawn structure to evaluate(), with the pawn
+    structures kept in a PawnTable of `table_size` slots"""
+    def __init__(self, table_size=1 << 14):
+        self.pawns = PawnTable(table_size)
+
+    def __call__(self, game, side=WHITE):
+        """Evaluation of the position in centipawns from the point of view of side,
+        white by default"""
+        grid = game.board.grid
+        score = grid.score + self.pawns.probe(grid)[0]
+        return score if side == WHITE else -score
+
+    def passed_pawns(self, game):
+        """Bitboard of the passed pawns of both colors"""
+        return self.pawns.probe(game.board.grid)[1]
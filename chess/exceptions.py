@@ -20,3 +20,6 @@ class GameOver(Exception):
 
 class GameAlreadyStarted(Exception):
     """An action requiring the game to be waiting was attempted after starting it"""
+
+class InvalidFen(ValueError):
+    """A position in Forsyth-Edwards notation couldn't be parsed"""
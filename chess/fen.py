@@ -0,0 +1,85 @@
+"""Forsyth-Edwards notation, converted from and to the snapshots of Chess.snapshot()"""
+from .bitboard import WHITE, BLACK, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, SQUARES, SQUARE_NAMES
+from .exceptions import InvalidFen
+
+STARTING_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w - - 0 1'
+
+PIECE_LETTERS = 'pnbrqk' # by bitboard piece kind
+_KINDS = {'p': PAWN, 'n': KNIGHT, 'b': BISHOP, 'r': ROOK, 'q': QUEEN, 'k': KING}
+_CASTLING = set('KQkq')
+
+def parse(fen):
+    """Snapshot of the position in FEN. Castling rights are accepted but ignored, since
+    the game doesn't have castling. The move counters may be left out."""
+    fields = fen.split()
+    if not 4 <= len(fields) <= 6:
+        raise InvalidFen(f'Expected 4 to 6 fields in the FEN: {fen!r}')
+    placement, side, castling, en_passant = fields[:4]
+    counters = fields[4:] + ['0', '1'][len(fields) - 4:]
+
+    rows = placement.split('/')
+    if len(rows) != 8:
+        raise InvalidFen(f'Expected 8 ranks in the placement: {placement!r}')
+    codes = bytearray(64)
+    for rank, row in enumerate(reversed(rows)):
+        file = 0
+        for char in row:
+            if char in '12345678':
+                file += int(char)
+            elif char.lower() in _KINDS:
+                if file < 8:
+                    piece_side = WHITE if char.isupper() else BLACK
+                    codes[rank * 8 + file] = 1 + 6 * piece_side + _KINDS[char.lower()]
+                file += 1
+            else:
+                raise InvalidFen(f'Unknown piece {char!r} in the placement: {placement!r}')
+        if file != 8:
+            raise InvalidFen(f'Expected 8 files on rank {rank + 1}: {row!r}')
+
+    if side not in ('w', 'b'):
+        raise InvalidFen(f'Expected w or b as the side to move: {side!r}')
+    if castling != '-' and (not set(castling) <= _CASTLING or len(set(castling)) != len(castling)):
+        raise InvalidFen(f'Invalid castling rights: {castling!r}')
+    if en_passant == '-':
+        en_passant = None
+    elif en_passant in SQUARES and en_passant[1] == ('6' if side == 'w' else '3'):
+        en_passant = SQUARES[en_passant]
+    else:
+        raise InvalidFen(f'Invalid en passant square: {en_passant!r}')
+    try:
+        halfmove_clock, fullmove_number = (int(counter) for counter in counters)
+    except ValueError:
+        raise InvalidFen(f'Invalid move counters: {" ".join(counters)!r}') from None
+    if halfmove_clock < 0 or fullmove_number < 1:
+        raise InvalidFen(f'Invalid move counters: {" ".join(counters)!r}')
+
+    return (bytes(codes), WHITE if side == 'w' else BLACK, en_passant,
+            halfmove_clock, fullmove_number)
+
+def serialize(snapshot):
+    """FEN of the snapshot"""
+    placement, side, en_passant, halfmove_clock, fullmove_number = snapshot
+    rows = []
+    for rank in range(7, -1, -1):
+        row, empty = [], 0
+        for code in placement[rank * 8:rank * 8 + 8]:
+            if not code:
+                empty += 1
+                continue
+            if empty:
+                row.append(str(empty))
+                empty = 0
+            piece_side, kind = divmod(code - 1, 6)
+            letter = PIECE_LETTERS[kind]
+            row.append(letter.upper() if piece_side == WHITE else letter)
+        if empty:
+            row.append(str(empty))
+        rows.append(''.join(row))
+    return ' '.join((
+        '/'.join(rows),
+        'w' if side == WHITE else 'b',
+        '-', # no castling
+        '-' if en_passant is None else SQUARE_NAMES[en_passant],
+        str(halfmove_clock),
+        str(fullmove_number),
+    ))
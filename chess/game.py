@@ -1,5 +1,4 @@
 """The game of chess"""
-from itertools import zip_longest
 from .board import Board
 from .piece import (
     King,
@@ -12,24 +11,74 @@ from .piece import (
 from .colors import (
     COLOR,
     BG2,
+    side_of,
     RESET_STYLE,
-    FG_WHITE,
-    FG_BLACK
 )
 from .exceptions import (
     PlayerExists,
-    NotYourTurn,
-    GameNotStarted,
     GameAlreadyStarted,
     GameOver,
 )
-from .helpers import char_range, rpad_ansi, algdelta
+from .helpers import char_range
+from .bitboard import (
+    WHITE,
+    BLACK,
+    PAWN,
+    QUEEN,
+    KING,
+    SQUARES,
+    SQUARE_NAMES,
+    PAWN_ATTACKS,
+    iter_bits,
+    lowest_square,
+)
+from .movegen import (
+    legal_moves,
+    has_legal_move,
+    king_attackers,
+    en_passant_square,
+    exposes_king,
+)
+from .zobrist import BLACK_TO_MOVE, EN_PASSANT_KEYS
+from .move import (
+    MoveLog,
+    encode,
+    promotion_flags,
+    QUIET,
+    DOUBLE_PUSH,
+    CAPTURE,
+    EN_PASSANT,
+    CHECK,
+    MATE,
+    STALEMATE,
+    UNKNOWN,
+)
+from . import perft, legality
+from .position import Position
+from .render import move_text
+from .view import BoardView
+from .legality import REASON, game_move_reason, move_error, captured_piece
+
+# piece classes by bitboard piece kind
+PIECE_TYPES = (Pawn, Knight, Bishop, Rook, Queen, King)
+# piece class and color by the code of a piece in a Position placement
+PIECE_CODES = (None,) + tuple((piece_type, color) for color in (COLOR.white, COLOR.black)
+                              for piece_type in PIECE_TYPES)
+# an empty board, for a game that gets its pieces from another one, see Chess.copy()
+_EMPTY = Position(bytes(64), WHITE, None, 0, 1)
 
 class Chess(object):
-    """The game"""
-    def __init__(self):
+    """The game
+
+    A game is played by one thread, and only that thread may query it: a move changes
+    the grid in place, and is_in_check(), attackers_of() and Board.attackers() bring
+    the attack map of the grid up to date in place the first time they're called after
+    a move. Other threads query `view`, a BoardView of the position replaced after each
+    move, which is never changed, see chess.view."""
+    def __init__(self, snapshot=None):
+        """Start a new game, or continue from a Position saved with snapshot()"""
         self.board = Board(self)
-        self.moves = []
+        self.moves = MoveLog(self)
         self.players = {
             COLOR.white: None,
             COLOR.black: None
@@ -39,11 +88,25 @@ class Chess(object):
             COLOR.white: [],
             COLOR.black: []
         }
-        self._generate_pieces()
         # state
         self.started = False
         self.turn = None
         self.over = False
+        # if False, moves don't work out whether they end the game, see status()
+        self.detect_game_end = True
+        self._status = None # status() of the position, until the next push() or pop()
+        # position state besides the placement of the pieces
+        self.en_passant = None # index of the square a pawn skipped on the previous move
+        self.halfmove_clock = 0 # moves since the last capture or pawn move
+        self.fullmove_number = 1
+        self._undo = []
+        self._redo = [] # moves taken back with undo() and their status, last first
+        self.initial_snapshot = snapshot # None for the standard starting position
+        if snapshot is None:
+            self._generate_pieces()
+        else:
+            self._restore(snapshot)
+        self.view = BoardView.of(self)
 
     def add_player(self, player):
         """Add players to a game that hasn't started yet."""
@@ -59,146 +122,300 @@ class Chess(object):
         """If both of the players are present, the game can start."""
         if not self.started and self.players[COLOR.white] and self.players[COLOR.black]:
             self.started = True
-            self.turn = COLOR.white
+            if self.turn is None: # unless continuing from a snapshot
+                self.turn = COLOR.white
+            self.view = BoardView.of(self)
 
     def move(self, piece, position):
         """Check if it's the piece's turn to move and try to move the piece on the chessboard."""
-        if self.over:
-            raise GameOver('The game is already over')
-        if not self.started:
-            raise GameNotStarted('You must start the game first')
-        if not self.turn == piece.color:
-            raise NotYourTurn("Wait for your turn")
-
-        old_position = piece.position
-        # try to move the piece
-        captured = self.board.move(piece, position)
+        reason = game_move_reason(self, piece, position)
+        if reason != REASON.legal:
+            if (not self.detect_game_end and reason != REASON.not_started and
+                    self.status() in (MATE, STALEMATE)):
+                # the previous move ended the game without finding out
+                self.over = True
+                reason = REASON.game_over
+            raise move_error(self, reason, piece, position)
+
+        self._redo.clear()
+        move, piece, captured, pawn = self._commit(piece, SQUARES[position])
+        # the move was successful, add it to the game moves
+        try:
+            self._log_move(move, piece, captured, pawn)
+        finally:
+            self.view = BoardView.of(self)
+        return captured
+
+    def _commit(self, piece, target):
+        """Make a legal move of the piece to the square with index `target`, keeping the
+        pieces and the captured pieces up to date. Return the encoded move, the piece
+        that moved or the one a pawn was promoted to, the captured piece and the pawn
+        promoted."""
+        square = piece.square
+        captured = captured_piece(self, piece, SQUARE_NAMES[target])
+        # finally move the piece on the chessboard
+        self.push((square, target))
+        flags = CAPTURE if captured else QUIET
+        pawn = None
         # if a pawn reaches to the opposite edge, promote it
         if piece.promoted_piece:
-            piece = piece.promoted_piece
+            pawn, piece = piece, piece.promoted_piece
             self.pieces[piece.piece_id] = piece
+            flags = promotion_flags(QUEEN, bool(captured))
+        elif piece.kind == PAWN:
+            if captured and captured.square != target:
+                flags = EN_PASSANT
+            elif abs(target - square) == 16:
+                flags = DOUBLE_PUSH
         if captured:
-            # remove captured piece from chessboard and add it to captured pieces
-            self.board[captured.position].piece = None
+            # add the captured piece to captured pieces
             captured.captured = True
             self.captured[captured.color].append(captured)
-        # finally move the piece on the chessboard
-        self.board[old_position].piece = None
-        self.board[position].piece = piece
-        # the move was successful, add it to the game moves
-        self._log_move(old_position, position, piece, captured)
-        # change turn
-        self.turn = COLOR.white if self.turn == COLOR.black else COLOR.black
-        return captured
+        return encode(square, target, flags), piece, captured, pawn
+
+    def undo(self):
+        """Take back the last move made with move() and return it as a (from, to) pair
+        of positions, or None if there are no moves. The move can be made again with
+        redo() until another move is made."""
+        if not self.moves:
+            return None
+        move = self._take_back()
+        self.view = BoardView.of(self)
+        return move
+
+    def redo(self):
+        """Make the last move taken back with undo() again and return it as a (from, to)
+        pair of positions, or None if there's none"""
+        if not self._redo:
+            return None
+        move = self._make_again()
+        self.view = BoardView.of(self)
+        return move
+
+    def goto(self, ply):
+        """Go back or forward to the position after `ply` moves, taking back moves or
+        making the ones taken back again. Costs a step per ply between the positions."""
+        if not 0 <= ply <= len(self.moves) + len(self._redo):
+            raise IndexError(f'No position after {ply} moves')
+        while len(self.moves) > ply:
+            self._take_back()
+        while len(self.moves) < ply:
+            self._make_again()
+        self.view = BoardView.of(self)
+
+    def _take_back(self):
+        move, details = self.moves.pop()
+        piece, captured = self._undo[-1][1:3] # the pawn rather than the piece promoted to
+        self.pop()
+        square = move & 63
+        self.pieces[piece.piece_id] = piece
+        if captured:
+            captured.captured = False
+            self.captured[captured.color].pop()
+        self.over = False
+        self._redo.append((move, details >> 13))
+        return SQUARE_NAMES[square], SQUARE_NAMES[move >> 6 & 63]
+
+    def _make_again(self):
+        move, status = self._redo.pop()
+        square, target = move & 63, move >> 6 & 63
+        move, piece, captured, pawn = self._commit(self.board.grid.pieces[square], target)
+        # the status is the one the move was logged with, the game isn't analysed again
+        self.moves.append(move, piece, captured, status, pawn)
+        if status in (MATE, STALEMATE):
+            self.over = True
+        return SQUARE_NAMES[square], SQUARE_NAMES[target]
+
+    def push(self, move):
+        """Apply a move to the position without validating it, and remember how to take
+        it back with pop(). `move` is a (from, to) pair of square indices, like the ones
+        generated by chess.movegen. The turn passes to the opponent."""
+        square, target = move
+        grid = self.board.grid
+        piece = grid.remove(square)
+        piece.square = target
+        captured_square = target
+        if piece.kind == PAWN and target == self.en_passant and square & 7 != target & 7:
+            # en passant, the captured pawn is beside the pawn
+            captured_square = (square & ~7) | (target & 7)
+        captured = grid.remove(captured_square)
+
+        self._undo.append((move, piece, captured, captured_square, self.en_passant,
+                           self.halfmove_clock, self.fullmove_number, self.turn))
+
+        moved = piece
+        self.en_passant = None
+        if piece.kind == PAWN:
+            moved = piece._check_promotion(target) or piece
+            if abs(target - square) == 16:
+                self.en_passant = (square + target) // 2
+            self.halfmove_clock = 0
+        elif captured:
+            self.halfmove_clock = 0
+        else:
+            self.halfmove_clock += 1
+        if piece.side == BLACK:
+            self.fullmove_number += 1
+        grid.put(target, moved)
+        self.turn = COLOR.black if piece.side == WHITE else COLOR.white
+        self._status = None
+
+    def pop(self):
+        """Take back the last move applied with push() and return it"""
+        (move, piece, captured, captured_square, self.en_passant,
+         self.halfmove_clock, self.fullmove_number, self.turn) = self._undo.pop()
+        square, target = move
+        grid = self.board.grid
+        grid.remove(target)
+        grid.put(square, piece)
+        piece.square = square
+        if captured:
+            grid.put(captured_square, captured)
+        piece.promoted_piece = None
+        self._status = None
+        return move
+
+    def _log_move(self, move, piece, captured, promoted=None):
+        if not self.detect_game_end:
+            self.moves.append(move, piece, captured, UNKNOWN, promoted)
+            return
+        status = self.status()
+        self.moves.append(move, piece, captured, status, promoted)
 
-    def _log_move(self, old_position, position, piece, captured):
-        other_color = COLOR.black if piece.color == COLOR.white else COLOR.white
-        threatening_pieces = self._is_check(other_color)
-        mate = threatening_pieces and self._is_mate(other_color, threatening_pieces)
-        stale = not threatening_pieces and not self._can_move(other_color)
-
-        self.moves.append(dict(
-            move_from=old_position,
-            move_to=position,
-            piece=piece,
-            move_id=len(self.moves),
-            captured=captured,
-            check=bool(threatening_pieces),
-            mate=mate,
-            stale=stale,
-        ))
-
-        if mate:
+        if status == MATE:
+            self.over = True
             raise GameOver(f'Game over. {piece.color.name.capitalize()} wins')
-        elif stale:
+        elif status == STALEMATE:
+            self.over = True
             raise GameOver('Game over. Stalemate')
 
+    def status(self):
+        """CHECK, MATE or STALEMATE if the side to move is in one, 0 otherwise. It's
+        worked out the first time it's asked for and remembered until the position
+        changes with push() or pop(). Finding that the side isn't stalemated stops at
+        its first legal move."""
+        if self._status is None:
+            side = side_of(self.turn)
+            check = king_attackers(self, side)
+            if has_legal_move(self, side):
+                self._status = CHECK if check else 0
+            else:
+                self._status = MATE if check else STALEMATE
+        return self._status
+
+    def position_key(self):
+        """64-bit Zobrist hash of the position: the placement of the pieces, the side to
+        move and the en passant file if a pawn could capture en passant"""
+        key = self.board.grid.key
+        side = side_of(self.turn)
+        if side == BLACK:
+            key ^= BLACK_TO_MOVE
+        en_passant = en_passant_square(self, side)
+        if en_passant is not None:
+            grid = self.board.grid
+            # the pawns that could capture are where an opponent's pawn would attack from
+            if PAWN_ATTACKS[side ^ 1][en_passant] & grid.kinds[PAWN] & grid.colors[side]:
+                key ^= EN_PASSANT_KEYS[en_passant & 7]
+        return key
+
+    def check_move(self, move_from, move_to):
+        """Whether the piece at move_from can move to move_to, as a MoveCheck of a legal
+        flag and a REASON code. Nothing is raised and no messages are formatted."""
+        return legality.check_move(self, move_from, move_to)
+
     def results_in_check(self, piece, position):
-        """Before letting the piece move be committed, check if it would result in check"""
-        # backup
-        original_position = piece.position
-        target_piece = self.board[position].piece
-        # fake commit
-        if target_piece:
-            target_piece.captured = True
-        self.board[original_position].piece = None
-        self.board[position].piece = piece
-        piece.moves.append((original_position, position, len(self.moves)))
-        piece.position = position
-        # check check
-        threatening_pieces = self._is_check(piece.color)
-        # undo commit
-        if target_piece:
-            target_piece.captured = False
-        self.board[position].piece = target_piece
-        piece.moves.pop()
-        piece.position = original_position
-        self.board[original_position].piece = piece
-
-        return bool(threatening_pieces)
+        """Before letting the piece move be committed, check if it would result in check.
+        The move isn't made, the bitboards it would leave are worked out instead."""
+        grid = self.board.grid
+        king = grid.kinds[KING] & grid.colors[piece.side]
+        if not king:
+            return False
+        square, target = piece.square, SQUARES[position]
+        captured_square = target
+        if piece.kind == PAWN and target == self.en_passant and square & 7 != target & 7:
+            captured_square = (square & ~7) | (target & 7)
+        return exposes_king(grid, piece.side, lowest_square(king), square, target,
+                            captured_square)
 
     def _is_check(self, color):
         """If color's king is in check, return the threatening pieces"""
-        pieces = [p for p in self.pieces.values() if not p.captured]
-        king = next(p for p in pieces if isinstance(p, King) and p.color == color)
-        threatening_pieces = []
-        for piece in pieces:
-            if piece.color != color:
-                if piece.can_capture(king.position):
-                    threatening_pieces.append(piece)
-        return threatening_pieces
-
-    def _is_mate(self, color, threatening_pieces):
-        """color's opponent has won"""
-        pieces = [p for p in self.pieces.values() if p.color == color and not p.captured]
-        king = next(p for p in pieces if isinstance(p, King))
-        if not king.can_move():
-            # if the check can be prevented by capturing the threatening piece
-            for threatening_piece in threatening_pieces:
-                for piece in pieces:
-                    if piece.can_capture(threatening_piece.position):
-                        return False
-            # if the check can be prevented by interposing a piece between the
-            # threatening piece and the king
-            for threatening_piece in [p for p in threatening_pieces
-                                      if not isinstance(p, (Knight, Pawn))]:
-                start, end = threatening_piece.position, king.position
-                file_delta, rank_delta = algdelta(start, end)
-                # diagonal
-                if abs(file_delta) != abs(rank_delta):
-
-                    intermediate_positions = zip(
-                        char_range(start[0], end[0]),
-                        char_range(start[1], end[1])
-                    )
-                    prev = next(intermediate_positions) # skip the starting position
-                # parallel
-                else:
-                    intermediate_positions = zip_longest(
-                        char_range(start[0], end[0]),
-                        char_range(start[1], end[1]),
-                        fillvalue=end[0 if start[0] == end[0] else 1]
-                    )
-                    prev = ''.join(next(intermediate_positions)) # skip the starting position
-                # all squares between the threatening piece and the king
-                positions = []
-                for pos in intermediate_positions:
-                    positions.append(prev)
-                    prev = ''.join(pos)
-                for position in positions:
-                    # check if the attacker and the king can be interposed
-                    for piece in pieces:
-                        if piece.can_reach(position):
-                            return False
-            self.over = True
-            return True
+        grid = self.board.grid
+        side = side_of(color)
+        king = grid.kinds[KING] & grid.colors[side]
+        if not king:
+            return []
+        attackers = grid.attack_map.attackers_of(lowest_square(king), side ^ 1)
+        return [grid.pieces[square] for square in iter_bits(attackers)]
+
+    def is_in_check(self, color):
+        """Check if color's king is attacked"""
+        return bool(self._is_check(color))
+
+    def attackers_of(self, position, color):
+        """Positions of color's pieces attacking position"""
+        return self.board.attackers(position, color)
 
-    def _can_move(self, color):
-        """If color can't move but isn't in check, the game ends in stalemate"""
-        pieces = [p for p in self.pieces.values() if p.color == color and not p.captured]
-        for piece in pieces:
-            if piece.can_move():
-                return True
+    def legal_moves(self, color=None):
+        """All legal moves of color, by default the color whose turn it is, as
+        (from, to) pairs of positions"""
+        color = color or self.turn or COLOR.white # white moves first
+        side = side_of(color)
+        return [(SQUARE_NAMES[s], SQUARE_NAMES[t]) for s, t in legal_moves(self, side)]
+
+    def perft(self, depth, table=None):
+        """Number of move sequences of depth moves from the current position, see
+        chess.perft"""
+        return perft.perft(self, depth, table)
+
+    def divide(self, depth, table=None):
+        """perft() of each legal move, by (from, to) pair of positions"""
+        return perft.divide(self, depth, table)
+
+    @classmethod
+    def from_fen(cls, position):
+        """New game continuing from a position in Forsyth-Edwards notation. Raises
+        InvalidFen if it can't be parsed."""
+        return cls(Position.from_fen(position))
+
+    def fen(self):
+        """The position in Forsyth-Edwards notation"""
+        return self.snapshot().fen()
+
+    def snapshot(self):
+        """Immutable Position of the game, which can be pickled and passed to Chess() to
+        continue from it"""
+        placement = bytes([0 if piece is None else 1 + 6 * piece.side + piece.kind
+                           for piece in self.board.grid.pieces])
+        side = side_of(self.turn)
+        return Position(placement, side, self.en_passant, self.halfmove_clock,
+                        self.fullmove_number)
+
+    def copy(self):
+        """New game continuing from the current position, as started or over as this
+        one, without players or history. Moves made in either game don't affect the
+        other. The copy gets new pieces but shares the bitboards, hashes and evaluation
+        of the grid, which are ints, and a copy of its attack map."""
+        game = Chess(_EMPTY)
+        game.initial_snapshot = self.snapshot()
+        game.board.grid.copy_from(self.board.grid)
+        game.board.update_piece_positions()
+        game.turn, game.en_passant = self.turn, self.en_passant
+        game.halfmove_clock, game.fullmove_number = self.halfmove_clock, self.fullmove_number
+        game.started, game.over = self.started, self.over
+        game.detect_game_end = self.detect_game_end
+        game.view = BoardView.of(game)
+        return game
+
+    def _restore(self, snapshot):
+        placement, side, self.en_passant, self.halfmove_clock, self.fullmove_number = snapshot
+        pieces = [None] * 64
+        for square, code in enumerate(placement):
+            if code:
+                piece_type, color = PIECE_CODES[code]
+                pieces[square] = piece_type(color)
+        self.board.grid.load(pieces)
+        self.board.update_piece_positions()
+        self.turn = COLOR.white if side == WHITE else COLOR.black
 
     def _generate_pieces(self):
         # black
@@ -248,20 +465,7 @@ class Chess(object):
         # list of moves
         log = [[BG2, ' ' * 7, RESET_STYLE] for _ in range(len(rows))]
         for i, log_data in enumerate(self.moves[-len(rows):]):
-            log_text = []
-
-            if isinstance(log_data['piece'], Pawn):
-                log_text.append(FG_WHITE if log_data['piece'].color == COLOR.white else FG_BLACK)
-                if log_data['captured']:
-                    log_text.append(log_data['move_from'][0] + 'x')
-            else:
-                log_text.append(str(log_data['piece']))
-                if log_data['captured']:
-                    log_text.append('x')
-
-            log_text.append(log_data['move_to'])
-
-            log[i][1] = rpad_ansi(''.join(log_text), 7, ' ')
+            log[i][1] = move_text(log_data)
 
         # chessboard and captured pieces on the left, list of moves on the right
         log_rows = [''.join(l) for l in log]
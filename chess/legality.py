@@ -0,0 +1,147 @@
+"""Checking moves without raising exceptions. The reason a move is illegal is an enum
+member, and the exception describing it is only made when it's going to be raised."""
+from collections import namedtuple
+from enum import Enum
+from .helpers import is_position
+from .bitboard import (
+    WHITE,
+    PAWN,
+    KNIGHT,
+    BISHOP,
+    ROOK,
+    KING,
+    SQUARES,
+    SQUARE_NAMES,
+    KNIGHT_ATTACKS,
+    KING_ATTACKS,
+    PAWN_ATTACKS,
+    ORTHOGONAL_LINES,
+    DIAGONAL_LINES,
+    BETWEEN,
+    lowest_square,
+)
+from .movegen import legal_moves, en_passant_square
+from .exceptions import IllegalMove, NotYourTurn, GameNotStarted, GameOver
+
+REASON = Enum('REASON', (
+    'legal',
+    'game_over',          # the game is already over
+    'not_started',        # the game hasn't started
+    'invalid_position',   # not a square on the board
+    'no_piece',           # no piece on the square moved from
+    'not_your_turn',      # the piece is the opponent's
+    'own_piece',          # the target is occupied by a piece of the same color
+    'bad_geometry',       # the piece doesn't move like that
+    'blocked',            # a piece is in the way
+    'nothing_to_capture', # a pawn moves diagonally without capturing
+    'king_in_check',      # the move leaves the king in check
+))
+
+MoveCheck = namedtuple('MoveCheck', ('legal', 'reason'))
+MoveCheck.__doc__ = """Whether a move is legal, and the REASON"""
+
+def check_move(game, move_from, move_to):
+    """MoveCheck of moving the piece at move_from to move_to in the game"""
+    if game.over:
+        return MoveCheck(False, REASON.game_over)
+    if not game.started:
+        return MoveCheck(False, REASON.not_started)
+    if not is_position(move_from):
+        return MoveCheck(False, REASON.invalid_position)
+    piece = game.board.grid.pieces[SQUARES[move_from]]
+    if piece is None:
+        return MoveCheck(False, REASON.no_piece)
+    reason = game_move_reason(game, piece, move_to)
+    return MoveCheck(reason == REASON.legal, reason)
+
+def game_move_reason(game, piece, position):
+    """REASON the piece can or can't move to position in the game, in the order the
+    game checks them: the state of the game, whose turn it is and the move itself"""
+    if game.over:
+        return REASON.game_over
+    if not game.started:
+        return REASON.not_started
+    if game.turn != piece.color:
+        return REASON.not_your_turn
+    return move_reason(game, piece, position)
+
+def move_reason(game, piece, position):
+    """REASON the piece can or can't move to position, whoever's turn it is"""
+    if not is_position(position):
+        return REASON.invalid_position
+    grid = game.board.grid
+    square, target = piece.square, SQUARES[position]
+    occupant = grid.pieces[target]
+    if occupant is not None and occupant.color == piece.color:
+        return REASON.own_piece
+
+    side, kind = piece.side, piece.kind
+    if kind == PAWN:
+        forward = 8 if side == WHITE else -8
+        if PAWN_ATTACKS[side][square] >> target & 1:
+            # a pawn moves diagonally only to capture, possibly en passant
+            if occupant is None and target != en_passant_square(game, side):
+                return REASON.nothing_to_capture
+        elif (target == square + forward or
+              (target == square + 2 * forward and
+               square >> 3 == (1 if side == WHITE else 6))):
+            if occupant is not None or BETWEEN[square][target] & grid.occupied:
+                return REASON.blocked
+        else:
+            return REASON.bad_geometry
+    elif kind == KNIGHT:
+        if not KNIGHT_ATTACKS[square] >> target & 1:
+            return REASON.bad_geometry
+    elif kind == KING:
+        if not KING_ATTACKS[square] >> target & 1:
+            return REASON.bad_geometry
+    else:
+        lines = ((ORTHOGONAL_LINES[square] if kind != BISHOP else 0) |
+                 (DIAGONAL_LINES[square] if kind != ROOK else 0))
+        if not lines >> target & 1:
+            return REASON.bad_geometry
+        if BETWEEN[square][target] & grid.occupied:
+            return REASON.blocked
+
+    if next(legal_moves(game, side, 1 << square, 1 << target), None) is None:
+        return REASON.king_in_check
+    return REASON.legal
+
+def captured_piece(game, piece, position):
+    """The piece captured if the piece moves to position, or None"""
+    grid = game.board.grid
+    square, target = piece.square, SQUARES[position]
+    captured = grid.pieces[target]
+    if captured is None and piece.kind == PAWN and square & 7 != target & 7:
+        # en passant, the pawn that moved 2 forward is beside the pawn
+        captured = grid.pieces[(square & ~7) | (target & 7)]
+    return captured
+
+def move_error(game, reason, piece, position):
+    """The exception to raise when the piece can't move to position for the reason"""
+    if reason == REASON.game_over:
+        return GameOver('The game is already over')
+    if reason == REASON.not_started:
+        return GameNotStarted('You must start the game first')
+    if reason == REASON.not_your_turn:
+        return NotYourTurn('Wait for your turn')
+    if reason == REASON.invalid_position:
+        return IllegalMove(f"'{position}' doesn't look like a valid position")
+    if reason == REASON.no_piece:
+        return IllegalMove(f'There is no piece at {position}')
+    if reason == REASON.own_piece:
+        return IllegalMove(f'{position} is already occupied by you')
+    if reason == REASON.bad_geometry:
+        return IllegalMove((piece.position, position))
+    if reason == REASON.blocked:
+        square, target = piece.square, SQUARES[position]
+        blocking = BETWEEN[square][target] & game.board.grid.occupied
+        if blocking:
+            # report the piece closest to the moving piece
+            target = lowest_square(blocking) if target > square else blocking.bit_length() - 1
+        return IllegalMove(f'There is a piece at {SQUARE_NAMES[target]}')
+    if reason == REASON.nothing_to_capture:
+        return IllegalMove(f'Nothing to capture at {position}')
+    if reason == REASON.king_in_check:
+        return IllegalMove("You can't put your king in check")
+    raise ValueError(reason)
@@ -0,0 +1,161 @@
+"""Moves packed into 16-bit ints, and the move log of a game built on them. A move has
+the index of the square it's from in bits 0-5, the index of the square it's to in bits
+6-11 and flags in bits 12-15."""
+from array import array
+from collections.abc import Sequence
+from .bitboard import KNIGHT, BISHOP, ROOK, QUEEN, SQUARE_NAMES
+
+# flags
+QUIET = 0
+DOUBLE_PUSH = 1
+KING_CASTLE = 2  # reserved, the game doesn't have castling
+QUEEN_CASTLE = 3 # reserved
+CAPTURE = 4
+EN_PASSANT = 5   # a capture
+PROMOTION = 8    # | the kind of piece - KNIGHT, | CAPTURE if it captures
+
+PROMOTION_KINDS = (KNIGHT, BISHOP, ROOK, QUEEN)
+
+def encode(square, target, flags=QUIET):
+    """Pack a move from the square with index `square` to `target`"""
+    return flags << 12 | target << 6 | square
+
+def promotion_flags(kind, capture=False):
+    """Flags of a promotion to `kind`"""
+    return PROMOTION | (kind - KNIGHT) | (CAPTURE if capture else 0)
+
+def move_from(move):
+    """Index of the square the move is from"""
+    return move & 63
+
+def move_to(move):
+    """Index of the square the move is to"""
+    return move >> 6 & 63
+
+def move_flags(move):
+    """Flags of the move"""
+    return move >> 12
+
+def is_capture(move):
+    """If the move captures a piece, including en passant"""
+    return bool(move >> 12 & CAPTURE)
+
+def promotion(move):
+    """Kind of piece the pawn is promoted to, or None"""
+    if move >> 12 & PROMOTION:
+        return PROMOTION_KINDS[move >> 12 & 3]
+    return None
+
+def move_name(move):
+    """The move as its squares in algebraic notation, followed by the letter of the
+    piece a pawn is promoted to, like e7e8q"""
+    kind = promotion(move)
+    return SQUARE_NAMES[move & 63] + SQUARE_NAMES[move >> 6 & 63] + ('' if kind is None else
+                                                                    'nbrq'[kind - KNIGHT])
+
+# what the move did to the opponent
+CHECK, MATE, STALEMATE = 1, 2, 3
+UNKNOWN = 4 # not worked out when the move was made
+
+class MoveLog(Sequence):
+    """The moves of a game, 4 bytes each: the move and a word with the piece_id of the
+    piece that moved (bits 0-5), the piece_id of the piece it captured + 1 (bits 6-12)
+    and whether it was check, mate or stalemate (bits 13-15). Statuses logged as
+    UNKNOWN are worked out by replaying the game when one is asked for. The replay is
+    kept at the last move it reached, so each move is only replayed once.
+
+    Indexing the log gives the moves as dicts of the pieces of the game, built when
+    they are asked for. They have the keys move_from, move_to, piece, move_id,
+    captured, check, mate and stale."""
+    __slots__ = ('game', 'codes', 'details', 'promotions', '_replay', '_replayed')
+
+    def __init__(self, game):
+        self.game = game
+        self.codes = array('H')
+        self.details = array('H')
+        self.promotions = {} # pawns by piece_id and the move_id they were promoted on
+        self._replay = None # game replaying the moves to work out their statuses
+        self._replayed = 0 # number of moves it made
+
+    def append(self, move, piece, captured=None, status=0, promoted=None):
+        """Log a move of piece. If the move is a promotion, piece is the piece promoted
+        to and `promoted` is the pawn."""
+        if promoted is not None:
+            self.promotions[piece.piece_id] = (len(self.codes), promoted)
+        self.codes.append(move)
+        self.details.append(piece.piece_id |
+                            (0 if captured is None else captured.piece_id + 1) << 6 |
+                            status << 13)
+
+    def pop(self):
+        """Remove the last move and return it and its details word"""
+        move, details = self.codes.pop(), self.details.pop()
+        promoted = self.promotions.get(details & 63)
+        if promoted is not None and promoted[0] == len(self.codes):
+            del self.promotions[details & 63]
+        if self._replayed > len(self.codes):
+            self._replay.pop()
+            self._replayed -= 1
+        return move, details
+
+    def status(self, move_id):
+        """CHECK, MATE or STALEMATE if the move gave one, 0 otherwise"""
+        status = self.details[move_id] >> 13
+        if status == UNKNOWN:
+            self._resolve(move_id)
+            status = self.details[move_id] >> 13
+        return status
+
+    def _resolve(self, last):
+        """Replay the moves up to the move numbered `last`, working out the statuses
+        that are UNKNOWN"""
+        if self._replay is None:
+            self._replay = type(self.game)(self.game.initial_snapshot)
+        replay, details = self._replay, self.details
+        for move_id in range(self._replayed, last + 1):
+            move = self.codes[move_id]
+            replay.push((move & 63, move >> 6 & 63))
+            if details[move_id] >> 13 == UNKNOWN:
+                details[move_id] = details[move_id] & 0x1fff | replay.status() << 13
+        self._replayed = max(self._replayed, last + 1)
+
+    def of_piece(self, piece_id):
+        """(move_id, move) of the moves of a piece"""
+        return [(move_id, self.codes[move_id]) for move_id, details in enumerate(self.details)
+                if details & 63 == piece_id]
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._entry(move_id) for move_id in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('move log index out of range')
+        return self._entry(index)
+
+    def _entry(self, move_id):
+        move, details = self.codes[move_id], self.details[move_id]
+        pieces = self.game.pieces
+        piece_id = details & 63
+        piece = pieces[piece_id]
+        promoted = self.promotions.get(piece_id)
+        if promoted is not None and move_id < promoted[0]:
+            piece = promoted[1] # the pawn before it was promoted
+        captured = details >> 6 & 127
+        status = self.status(move_id)
+        return dict(
+            move_from=SQUARE_NAMES[move & 63],
+            move_to=SQUARE_NAMES[move >> 6 & 63],
+            piece=piece,
+            move_id=move_id,
+            captured=pieces[captured - 1] if captured else None,
+            check=status in (CHECK, MATE),
+            mate=status == MATE,
+            stale=status == STALEMATE,
+        )
+
+    def __repr__(self):
+        return f'<MoveLog: {" ".join(move_name(move) for move in self.codes)}>'
@@ -0,0 +1,158 @@
+"""Move generation from the bitboards of the grid. Moves are (from, to) pairs of
+square indices. Pawns reaching the last rank are promoted to queens, so a pair is
+enough to describe any move."""
+from .bitboard import (
+    WHITE,
+    PAWN,
+    KNIGHT,
+    BISHOP,
+    ROOK,
+    QUEEN,
+    KING,
+    iter_bits,
+    lowest_square,
+    BETWEEN,
+    PAWN_ATTACKS,
+    KNIGHT_ATTACKS,
+    KING_ATTACKS,
+    rook_attacks,
+    bishop_attacks,
+)
+
+def en_passant_square(game, side):
+    """Index of the square side's pawns could capture en passant, or None. That's the
+    square an opponent's pawn skipped by moving 2 forward on the previous move."""
+    return _en_passant_for(game.en_passant, side)
+
+def _en_passant_for(en_passant, side):
+    # white pawns skip a square on the 3rd rank, black pawns on the 6th
+    if en_passant is None or (en_passant >> 3 == 5) != (side == WHITE):
+        return None
+    return en_passant
+
+def _targets(grid, square, en_passant):
+    """Bitboard of the squares the piece on `square` could move to if its own king
+    wasn't taken into account"""
+    piece = grid.pieces[square]
+    if piece.kind != PAWN:
+        return grid.attacks(square) & ~grid.colors[piece.side]
+
+    empty = ~grid.occupied
+    forward = 8 if piece.side == WHITE else -8
+    moves = 0
+    one = square + forward
+    if 0 <= one < 64 and empty >> one & 1:
+        moves |= 1 << one
+        two = one + forward
+        # 2 forward from the starting rank
+        if square >> 3 == (1 if piece.side == WHITE else 6) and empty >> two & 1:
+            moves |= 1 << two
+    capturable = grid.colors[piece.side ^ 1]
+    if en_passant is not None:
+        capturable |= 1 << en_passant
+    return moves | (PAWN_ATTACKS[piece.side][square] & capturable)
+
+def pseudo_legal_moves(game, side, squares=None, target_squares=None):
+    """Generate the moves of side's pieces without checking if they put the king in
+    check. The moves can be limited to pieces on the squares set in the bitboard
+    `squares` and to targets set in the bitboard `target_squares`."""
+    return grid_pseudo_legal_moves(game.board.grid, game.en_passant, side, squares,
+                                   target_squares)
+
+def grid_pseudo_legal_moves(grid, en_passant, side, squares=None, target_squares=None):
+    """pseudo_legal_moves of a grid, or of anything with the same bitboards, pieces,
+    attacks() and attackers(), with the en passant square of the position"""
+    own = grid.colors[side]
+    if squares is not None:
+        own &= squares
+    en_passant = _en_passant_for(en_passant, side)
+    for square in iter_bits(own):
+        moves = _targets(grid, square, en_passant)
+        if target_squares is not None:
+            moves &= target_squares
+        for target in iter_bits(moves):
+            yield square, target
+
+def king_attackers(game, side):
+    """Bitboard of the opponent's pieces attacking side's king, computed from the grid
+    rather than from the attack map, which is cheaper right after a push()"""
+    grid = game.board.grid
+    king = grid.kinds[KING] & grid.colors[side]
+    if not king:
+        return 0
+    return grid.attackers(lowest_square(king), side ^ 1)
+
+def pinned_pieces(grid, side, king):
+    """Bitboard of side's pieces standing alone between their king on the square `king`
+    and an opponent's sliding piece"""
+    own, kinds, occupied = grid.colors[side], grid.kinds, grid.occupied
+    pinning = grid.colors[side ^ 1]
+    pinned = 0
+    for attacks, sliders in ((rook_attacks, kinds[ROOK] | kinds[QUEEN]),
+                             (bishop_attacks, kinds[BISHOP] | kinds[QUEEN])):
+        blockers = attacks(king, occupied) & own
+        # look through the closest pieces
+        for pinner in iter_bits(attacks(king, occupied ^ blockers) & pinning & sliders):
+            pinned |= BETWEEN[king][pinner] & blockers
+    return pinned
+
+def exposes_king(grid, side, king, square, target, captured_square):
+    """If side's move from square to target, capturing on captured_square, leaves its
+    king on the square `king` attacked, worked out from the bitboards as they'd be
+    after the move rather than by making it"""
+    removed = ~(1 << square | 1 << captured_square)
+    occupied = grid.occupied & removed | 1 << target
+    if king == square:
+        king = target
+    kinds = grid.kinds
+    return grid.colors[side ^ 1] & removed & (
+        (KNIGHT_ATTACKS[king] & kinds[KNIGHT]) |
+        (KING_ATTACKS[king] & kinds[KING]) |
+        (PAWN_ATTACKS[side][king] & kinds[PAWN]) |
+        (bishop_attacks(king, occupied) & (kinds[BISHOP] | kinds[QUEEN])) |
+        (rook_attacks(king, occupied) & (kinds[ROOK] | kinds[QUEEN]))
+    ) != 0
+
+def legal_moves(game, side, squares=None, target_squares=None):
+    """Generate the moves of side's pieces that don't put their own king in check,
+    limited like in pseudo_legal_moves. Neither the game nor its grid is changed."""
+    return grid_legal_moves(game.board.grid, game.en_passant, side, squares, target_squares)
+
+def grid_legal_moves(grid, en_passant, side, squares=None, target_squares=None):
+    """legal_moves of a grid, like grid_pseudo_legal_moves"""
+    king = grid.kinds[KING] & grid.colors[side]
+    if not king:
+        yield from grid_pseudo_legal_moves(grid, en_passant, side, squares, target_squares)
+        return
+    king_square = lowest_square(king)
+    attack_map = grid.attack_map
+    if attack_map is None or attack_map.dirty:
+        # while searching, one query is cheaper than bringing the map up to date
+        checkers = grid.attackers(king_square, side ^ 1)
+    else:
+        checkers = attack_map.attackers[king_square] & grid.colors[side ^ 1]
+    pinned = pinned_pieces(grid, side, king_square)
+    en_passant = _en_passant_for(en_passant, side)
+    pawns = grid.kinds[PAWN]
+    for move in grid_pseudo_legal_moves(grid, en_passant, side, squares, target_squares):
+        square, target = move
+        if square == king_square:
+            # the king must not be attacked on the target, nor by sliders it moves
+            # away from along their ray
+            if grid.attackers(target, side ^ 1, grid.occupied ^ king):
+                continue
+        elif target == en_passant and pawns >> square & 1:
+            # en passant removes 2 pieces from a rank
+            if exposes_king(grid, side, king_square, square, target,
+                            (square & ~7) | (target & 7)):
+                continue
+        elif checkers or pinned >> square & 1:
+            # the move has to block or capture the checking piece, or stay on the line
+            # of the pin
+            if exposes_king(grid, side, king_square, square, target, target):
+                continue
+        yield move
+
+def has_legal_move(game, side):
+    """Check if side has any legal move, stopping at the first one found"""
+    return next(legal_moves(game, side), None) is not None
@@ -0,0 +1,82 @@
+"""Counting the positions reachable in a number of moves, for checking the move
+generator against known counts and for measuring its speed"""
+from .bitboard import SQUARE_NAMES
+from .colors import side_of
+from .movegen import legal_moves
+from .table import SlotTable
+
+class PerftTable(SlotTable):
+    """Node counts by position key and depth in a fixed number of slots. A new count
+    always replaces the one in its slot."""
+    def __init__(self, size=1 << 16):
+        SlotTable.__init__(self, size)
+        self.hits = 0
+
+    def get(self, key, depth):
+        """Return the number of nodes stored for the key and depth, or None"""
+        # the entries are stored by the key mixed with the depth
+        entry = self.entry(key ^ depth)
+        if entry is not None and entry[1] == depth:
+            self.hits += 1
+            return entry[2]
+        return None
+
+    def store(self, key, depth, nodes):
+        self.put((key ^ depth, depth, nodes))
+
+def perft(game, depth, table=None):
+    """Number of move sequences of `depth` moves from the position of the game, for the
+    side whose turn it is. Counts of positions already counted are looked up in the
+    PerftTable if one is given."""
+    side = side_of(game.turn)
+    return _perft(game, side, depth, table)
+
+def divide(game, depth, table=None):
+    """perft() of each legal move, by (from, to) pair of positions"""
+    side = side_of(game.turn)
+    counts = {}
+    for move in list(legal_moves(game, side)):
+        game.push(move)
+        try:
+            nodes = _perft(game, side ^ 1, depth - 1, table)
+        finally:
+            game.pop()
+        counts[(SQUARE_NAMES[move[0]], SQUARE_NAMES[move[1]])] = nodes
+    return counts
+
+def _perft(game, side, depth, table):
+    if depth <= 0:
+        return 1
+    moves = list(legal_moves(game, side))
+    if depth == 1:
+        # the leaves don't have to be visited
+        return len(moves)
+    if table is not None:
+        key = game.position_key()
+        nodes = table.get(key, depth)
+        if nodes is not None:
+            return nodes
+    nodes = 0
+    for move in moves:
+        game.push(move)
+        try:
+            nodes += _perft(game, side ^ 1, depth - 1, table)
+        finally:
+            game.pop()
+    if table is not None:
+        table.store(key, depth, nodes)
+    return nodes
+
+# (name, FEN, node counts from depth 1 on) of positions from the Chess Programming
+# Wiki, without castling rights and counting queen promotions only, as the move
+# generator doesn't castle or underpromote
+POSITIONS = (
+    ('start', 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w - - 0 1',
+     (20, 400, 8902, 197281, 4865609)),
+    ('endgame', '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1',
+     (14, 191, 2812, 43238, 674624)),
+    ('tactics', 'r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w - - 0 1',
+     (6, 222, 7859, 306124, 11309268)),
+    ('promotion', 'n1n5/PPPk4/8/8/8/8/4Kppp/5N1N b - - 0 1',
+     (15, 210, 3253, 47828, 807048)),
+)
@@ -0,0 +1,236 @@
+"""Portable Game Notation. Games are read lazily one at a time, so that archives of any
+size can be streamed through in constant memory."""
+import os
+import re
+from collections import namedtuple
+from .bitboard import (
+    PAWN,
+    KNIGHT,
+    BISHOP,
+    ROOK,
+    QUEEN,
+    KING,
+    SQUARES,
+    SQUARE_NAMES,
+)
+from .colors import COLOR, side_of
+from .game import Chess
+from .movegen import legal_moves, has_legal_move, king_attackers
+from .move import move_from, move_to
+from .exceptions import IllegalMove, InvalidFen
+
+PgnGame = namedtuple('PgnGame', ('headers', 'moves', 'result', 'error'))
+PgnGame.__doc__ = """A game read from PGN: the tag pairs, the moves as (from, to) pairs
+of positions, or as SAN if they weren't resolved, the result, and why the moves
+couldn't be resolved, or None"""
+
+# the Seven Tag Roster, in this order before any other tags
+ROSTER = ('Event', 'Site', 'Date', 'Round', 'White', 'Black', 'Result')
+
+PIECE_LETTERS = {KNIGHT: 'N', BISHOP: 'B', ROOK: 'R', QUEEN: 'Q', KING: 'K'}
+_KINDS = {letter: kind for kind, letter in PIECE_LETTERS.items()}
+
+_TAG = re.compile(r'\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+_TOKEN = re.compile(r'''
+    (\{[^}]*\}) | (\{.*) | (;.*) | (\() | (\)) | (\$\d+)
+    | (1-0|0-1|1/2-1/2|\*)
+    | \d+\.+
+    | ([^\s{};()$.][^\s{};()$]*)
+''', re.VERBOSE)
+_ESCAPE = re.compile(r'\\(.)')
+_SAN = re.compile(r'^([NBRQK])?([a-h])?([1-8])?x?([a-h][1-8])(?:=?([NBRQ]))?[+#]?[!?]*$')
+
+def read_games(source, resolve=True):
+    """Generate the games in a PGN file, given as a path or a file object, as PgnGames.
+    The file is read a line at a time, and only the game being read is kept in
+    memory. Comments, variations and numeric annotation glyphs are skipped.
+
+    If `resolve` is true, the moves are resolved against the position, starting from
+    the FEN tag if there is one. Reading continues with the next game when a move
+    can't be resolved."""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding='utf-8', errors='replace') as file:
+            yield from read_games(file, resolve)
+        return
+
+    headers, sans = {}, []
+    in_comment = False
+    variations = 0 # nesting depth of the variation being skipped
+    for line in source:
+        if in_comment:
+            end = line.find('}')
+            if end < 0:
+                continue
+            in_comment = False
+            line = line[end + 1:]
+        elif line.startswith('%'):
+            continue # escaped line
+
+        if not variations and line.lstrip().startswith('['):
+            if sans:
+                # a game without a result, the tags of the next game begin
+                yield _game(headers, sans, '*', resolve)
+                headers, sans = {}, []
+            for name, value in _TAG.findall(line):
+                headers[name] = _ESCAPE.sub(r'\1', value)
+            continue
+
+        for match in _TOKEN.finditer(line):
+            (comment, open_comment, _, open_variation, close_variation, _, result,
+             san) = match.groups()
+            if open_comment:
+                in_comment = True
+            elif open_variation:
+                variations += 1
+            elif close_variation:
+                variations = max(variations - 1, 0)
+            elif variations or comment:
+                continue
+            elif result:
+                yield _game(headers, sans, result, resolve)
+                headers, sans = {}, []
+            elif san:
+                sans.append(san)
+
+    if headers or sans:
+        yield _game(headers, sans, headers.get('Result', '*'), resolve)
+
+def _game(headers, sans, result, resolve):
+    if not resolve:
+        return PgnGame(headers, sans, result, None)
+    _, moves, error = replay(headers, sans)
+    moves = [(SQUARE_NAMES[square], SQUARE_NAMES[target]) for square, target in moves]
+    return PgnGame(headers, moves, result, error)
+
+def replay(headers, sans):
+    """Play moves in SAN from the position of the FEN tag in `headers`, or from the
+    starting position, without logging them in the game. Return the game, the moves
+    played as (from, to) pairs of square indices and why the next move couldn't be
+    played, or None if all of them were."""
+    moves = []
+    try:
+        game = Chess.from_fen(headers['FEN']) if 'FEN' in headers else Chess()
+    except InvalidFen as e:
+        return None, moves, str(e)
+    try:
+        for san in sans:
+            move = parse_san(game, san)
+            game.push(move)
+            moves.append(move)
+    except IllegalMove as e:
+        return game, moves, str(e)
+    return game, moves, None
+
+def parse_san(game, san):
+    """Resolve a move in Standard Algebraic Notation to a (from, to) pair of square
+    indices against the position of the game, for the side whose turn it is"""
+    if san.startswith(('O-O', '0-0')):
+        raise IllegalMove(f"{san}: Castling isn't supported")
+    match = _SAN.match(san)
+    if not match:
+        raise IllegalMove(f"{san}: Not a move in SAN")
+    letter, file, rank, target, promotion = match.groups()
+    if promotion and promotion != 'Q':
+        raise IllegalMove(f'{san}: Pawns can only be promoted to queens')
+
+    grid = game.board.grid
+    side = side_of(game.turn)
+    kind = _KINDS[letter] if letter else PAWN
+    squares = grid.kinds[kind] & grid.colors[side]
+    candidates = [move for move in legal_moves(game, side, squares, 1 << SQUARES[target])
+                  if (not file or SQUARE_NAMES[move[0]][0] == file) and
+                  (not rank or SQUARE_NAMES[move[0]][1] == rank)]
+    if len(candidates) != 1:
+        problem = 'Illegal' if not candidates else 'Ambiguous'
+        raise IllegalMove(f'{san}: {problem} move')
+    return candidates[0]
+
+def format_san(game, move):
+    """The move, a (from, to) pair of square indices, in Standard Algebraic Notation"""
+    square, target = move
+    grid = game.board.grid
+    piece = grid.pieces[square]
+    side = piece.side
+    capture = grid.pieces[target] is not None
+
+    if piece.kind == PAWN:
+        text = [SQUARE_NAMES[target]]
+        if square & 7 != target & 7:
+            text.insert(0, SQUARE_NAMES[square][0] + 'x')
+        if target >> 3 in (0, 7):
+            text.append('=Q')
+    else:
+        text = [PIECE_LETTERS[piece.kind]]
+        # other pieces of the kind able to move to the same square
+        others = grid.kinds[piece.kind] & grid.colors[side] & ~(1 << square)
+        others = [s for s, _ in legal_moves(game, side, others, 1 << target)]
+        if others:
+            name = SQUARE_NAMES[square]
+            if all(SQUARE_NAMES[s][0] != name[0] for s in others):
+                text.append(name[0])
+            elif all(SQUARE_NAMES[s][1] != name[1] for s in others):
+                text.append(name[1])
+            else:
+                text.append(name)
+        if capture:
+            text.append('x')
+        text.append(SQUARE_NAMES[target])
+
+    game.push(move)
+    try:
+        if king_attackers(game, side ^ 1):
+            text.append('+' if has_legal_move(game, side ^ 1) else '#')
+    finally:
+        game.pop()
+    return ''.join(text)
+
+def game_result(game):
+    """Result of a Chess game in PGN"""
+    if game.moves and game.moves[-1]['mate']:
+        return '1-0' if game.moves[-1]['piece'].color == COLOR.white else '0-1'
+    if game.moves and game.moves[-1]['stale']:
+        return '1/2-1/2'
+    return '*'
+
+def format_game(game, headers=None):
+    """A Chess game in PGN, with the tag pairs in `headers`. The tags of the Seven Tag
+    Roster that aren't given are unknown."""
+    headers = dict(headers or {})
+    headers['Result'] = headers.get('Result', game_result(game))
+    replay = Chess(game.initial_snapshot)
+    if game.initial_snapshot is not None:
+        headers['SetUp'] = '1'
+        headers['FEN'] = replay.fen()
+    tags = list(ROSTER) + [name for name in headers if name not in ROSTER]
+    lines = []
+    for name in tags:
+        value = headers.get(name, '????.??.??' if name == 'Date' else '?')
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"')
+        lines.append(f'[{name} "{value}"]')
+    lines.append('')
+
+    tokens = []
+    for i, code in enumerate(game.moves.codes):
+        move = (move_from(code), move_to(code))
+        if replay.turn != COLOR.black:
+            tokens.append(f'{replay.fullmove_number}.')
+        elif i == 0:
+            tokens.append(f'{replay.fullmove_number}...')
+        tokens.append(format_san(replay, move))
+        replay.push(move)
+    tokens.append(headers['Result'])
+
+    # movetext lines of at most 80 characters
+    line = []
+    for token in tokens:
+        if line and len(' '.join(line)) + 1 + len(token) > 80:
+            lines.append(' '.join(line))
+            line = []
+        line.append(token)
+    lines.append(' '.join(line))
+    return '\n'.join(lines) + '\n'
+
+def write_game(file, game, headers=None):
+    """Write a Chess game in PGN to a file object, followed by an empty line"""
+    file.write(format_game(game, headers))
+    file.write('\n')
@@ -1,37 +1,62 @@
 """The black and white pieces used in the game"""
-from itertools import zip_longest
-from ..colors import FG_WHITE, FG_BLACK, COLOR
-from ..helpers import is_position, char_range
-from ..exceptions import IllegalMove
+from ..colors import FG_WHITE, FG_BLACK, COLOR, side_of
+from ..bitboard import SQUARE_NAMES
+from ..movegen import legal_moves
+from ..move import move_from, move_to
+from ..legality import REASON, MoveCheck, move_reason, move_error, captured_piece
 
 class Piece(object):
     """A base piece"""
+    kind = None # bitboard piece kind, set by subclasses
+    symbol = ' '
+    __slots__ = ('color', 'side', 'piece_id', 'square', 'game', 'captured', 'promoted_piece')
+
     def __init__(self, color):
         self.color = color
+        self.side = side_of(color)
         self.piece_id = -1
-        self.position = '' # init from Grid.update_piece_positions
+        # index of the square, init from Grid.update_piece_positions and then only
+        # changed by Chess.push() and Chess.pop()
+        self.square = None
         self.game = None   # init from Grid.update_piece_positions
-        self.symbol = ' '
-        self.moves = []
         self.captured = False
         self.promoted_piece = None # pawn only
 
+    @property
+    def position(self):
+        """The square of the piece in algebraic notation, '' if it hasn't been placed"""
+        return '' if self.square is None else SQUARE_NAMES[self.square]
+
+    @property
+    def moves(self):
+        """The moves of the piece as (from, to, move_id) with positions in algebraic
+        notation, from the move log of the game"""
+        if self.game is None:
+            return []
+        return [(SQUARE_NAMES[move_from(move)], SQUARE_NAMES[move_to(move)], move_id)
+                for move_id, move in self.game.moves.of_piece(self.piece_id)]
+
     def move(self, position, commit=True):
-        """Move the piece to the target position."""
-        if self.game.results_in_check(self, position):
-            raise IllegalMove("You can't put your king in check")
+        """Try to legally move the piece to `position` and return the piece it captures,
+        if captures. Raises IllegalMove describing why the move isn't legal. The move
+        is made with Chess.move(), so it has to be the piece's turn; with `commit`
+        False it's only checked, whoever's turn it is."""
         if commit:
-            move = (self.position, position, len(self.game.moves))
-            self.moves.append(move)
-            self.position = position
+            return self.game.move(self, position)
+        reason = move_reason(self.game, self, position)
+        if reason != REASON.legal:
+            raise move_error(self.game, reason, self, position)
+        return captured_piece(self.game, self, position)
+
+    def check_move(self, position):
+        """Whether the piece can legally move to position, as a MoveCheck, without
+        raising exceptions"""
+        reason = move_reason(self.game, self, position)
+        return MoveCheck(reason == REASON.legal, reason)
 
     def can_reach(self, position):
         """If the piece can reach position, return True"""
-        try:
-            self.move(position, commit=False)
-            return True
-        except IllegalMove:
-            return False
+        return move_reason(self.game, self, position) == REASON.legal
 
     def can_capture(self, position):
         """If the piece can capture a piece at position, return True"""
@@ -39,66 +64,25 @@ class Piece(object):
 
     def can_move(self):
         """Check if the piece can move at all"""
-        positions = [f + r for r in char_range('1', '8') for f in char_range('a', 'h')]
-        return any(self.can_reach(p) for p in positions)
+        return next(self._legal_moves(), None) is not None
+
+    def legal_moves(self):
+        """Positions the piece can legally move to"""
+        return [SQUARE_NAMES[target] for _, target in self._legal_moves()]
+
+    def _legal_moves(self):
+        return legal_moves(self.game, self.side, 1 << self.square)
 
     def get_starting_position(self):
         """Get the square where this piece started from."""
-        if not self.moves:
-            if is_position(self.position):
+        moves = self.moves
+        if not moves:
+            if self.square is not None:
                 return self.position
             else:
                 raise ValueError(f'{self.position} is not a valid position')
         else:
-            return self.moves[0][0]
-
-
-    def _move_parallel(self, position):
-        """Move the piece along a file or a rank"""
-        captured = None
-
-        intermediate_positions = zip_longest(
-            char_range(self.position[0], position[0]),
-            char_range(self.position[1], position[1]),
-            fillvalue=position[0 if self.position[0] == position[0] else 1]
-        )
-        next(intermediate_positions) # skip the starting position
-
-        for file, rank in intermediate_positions:
-            if captured: # a piece would have been captured on the previous iteration
-                raise IllegalMove(f'There is a piece at {captured.position}')
-            intermediate_pos = file + rank
-            square = self.game.board[intermediate_pos]
-            if square.piece:
-                if square.piece.color != self.color:
-                    captured = square.piece
-                else: # your own piece is in the way
-                    raise IllegalMove(f'There is a piece at {intermediate_pos}')
-
-        return captured
-
-    def _move_diagonal(self, position):
-        """Move the piece diagonally"""
-        captured = None
-
-        intermediate_positions = zip(
-            char_range(self.position[0], position[0]),
-            char_range(self.position[1], position[1])
-        )
-        next(intermediate_positions) # skip the starting position
-
-        for file, rank in intermediate_positions:
-            if captured: # a piece would have been captured on the previous iteration
-                raise IllegalMove(f'There is a piece at {captured.position}')
-            intermediate_pos = file + rank
-            square = self.game.board[intermediate_pos]
-            if square.piece:
-                if square.piece.color != self.color:
-                    captured = square.piece
-                else: # your own piece is in the way
-                    raise IllegalMove(f'There is a piece at {intermediate_pos}')
-
-        return captured
+            return moves[0][0]
 
     def __str__(self):
         fgcolor = FG_WHITE if self.color == COLOR.white else FG_BLACK
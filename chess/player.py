@@ -3,6 +3,8 @@ from .exceptions import NotYourPiece
 
 class Player(object):
     """The player"""
+    __slots__ = ('color', 'game')
+
     def __init__(self, color):
         self.color = color
         self.game = None
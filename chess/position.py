@@ -0,0 +1,24 @@
+"""Immutable snapshots of positions"""
+from collections import namedtuple
+from .fen import parse, serialize
+
+class Position(namedtuple('Position', (
+        'placement', 'side', 'en_passant', 'halfmove_clock', 'fullmove_number'))):
+    """A position as a tuple of plain values, made with Chess.snapshot() and turned
+    back into a playable game with Chess(position). It's immutable, so it can be
+    shared between any number of variations and pickled in about 120 bytes.
+
+    The placement has a byte for each square from a1 to h8, 0 for an empty square
+    and 1 + 6 * side + kind for a piece. The en passant square is the index of the
+    square a pawn skipped on the previous move, or None."""
+    __slots__ = ()
+
+    @classmethod
+    def from_fen(cls, fen):
+        """Position in Forsyth-Edwards notation. Raises InvalidFen if it can't be
+        parsed."""
+        return cls._make(parse(fen))
+
+    def fen(self):
+        """The position in Forsyth-Edwards notation"""
+        return serialize(self)
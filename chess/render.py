@@ -0,0 +1,134 @@
+"""Drawing games on ANSI terminals"""
+from itertools import chain
+from .bitboard import PAWN
+from .colors import COLOR, BG1, BG2, RESET_STYLE, FG_WHITE, FG_BLACK
+from .helpers import char_range
+
+CSI = '\x1b['
+CLEAR_SCREEN = CSI + '2J'
+CLEAR_BELOW = CSI + 'J'
+
+LOG_ROWS = 12 # captured pieces, files, 8 ranks, files, captured pieces
+LOG_WIDTH = 7
+BLANK_LOG_ROW = f'{BG2}{" " * LOG_WIDTH}{RESET_STYLE}'
+FILES_TEXT = ''.join(f' {c} ' for c in chain(' ', char_range('a', 'h'), ' '))
+
+def move_text(entry):
+    """A move of the move log, like Nxe5 with the piece symbol in its color, padded to
+    the width of the log column"""
+    piece = entry['piece']
+    if piece.kind == PAWN:
+        text = [FG_WHITE if piece.color == COLOR.white else FG_BLACK]
+        if entry['captured']:
+            text.append(entry['move_from'][0] + 'x')
+    else:
+        text = [str(piece)]
+        if entry['captured']:
+            text.append('x')
+    text.append(entry['move_to'])
+    # the escape sequence of the color is the first item and has no width
+    width = sum(len(item) for item in text[1:]) + (piece.kind != PAWN)
+    text.append(' ' * (LOG_WIDTH - width))
+    return ''.join(text)
+
+def move_cursor(row, column):
+    """Escape sequence moving the cursor to a row and column, counted from 1"""
+    return f'{CSI}{row};{column}H'
+
+class TerminalRenderer(object):
+    """Draws a game laid out like str(game), at a row and column of the terminal, but
+    with the move log column showing the moves a page of 12 at a time. The first frame
+    draws everything, the next ones only what changed since: the squares where a
+    different piece or no piece is, the captured pieces and the rows of the move log
+    column. A frame is a string of escape sequences and text to write to the terminal
+    as is."""
+    __slots__ = ('game', 'top', 'left', '_drawn', '_pieces', '_captured', '_moves', '_log_rows')
+
+    def __init__(self, game, top=1, left=1):
+        self.game = game
+        self.top = top
+        self.left = left
+        self.reset()
+
+    def reset(self):
+        """Draw everything in the next frame, like when something else was written to
+        the screen"""
+        self._drawn = False
+        self._pieces = [False] * 64 # the piece drawn on each square, or None
+        self._captured = {COLOR.white: [], COLOR.black: []}
+        self._moves = {} # text of the moves in the log column by move_id
+        self._log_rows = [None] * LOG_ROWS
+
+    def frame(self):
+        """Escape sequences and text bringing the terminal up to date with the game"""
+        out = []
+        if not self._drawn:
+            self._draw_frame(out)
+            self._drawn = True
+        self._draw_squares(out)
+        self._draw_captured(out)
+        self._draw_log(out)
+        return ''.join(out)
+
+    def footer(self, text=''):
+        """Escape sequences moving the cursor below the frame, clearing the rest of the
+        screen and writing text, if any, on its own line"""
+        return move_cursor(self.top + LOG_ROWS, 1) + CLEAR_BELOW + (text and text + '\n')
+
+    def _draw_frame(self, out):
+        top, left = self.top, self.left
+        out.append(CLEAR_SCREEN)
+        for row in (top, top + LOG_ROWS - 1):
+            out.append(f'{move_cursor(row, left)}   {BG2}{" " * 24}{RESET_STYLE}   ')
+        for row in (top + 1, top + LOG_ROWS - 2):
+            out.append(move_cursor(row, left) + FILES_TEXT)
+        for rank in range(8):
+            row = top + 9 - rank
+            out.append(f'{move_cursor(row, left)} {rank + 1} ')
+            out.append(f'{move_cursor(row, left + 27)} {rank + 1} ')
+
+    def _draw_squares(self, out):
+        top, left = self.top, self.left
+        drawn = self._pieces
+        for square, piece in enumerate(self.game.board.grid.pieces):
+            if piece is drawn[square]:
+                continue
+            drawn[square] = piece
+            rank, file = square >> 3, square & 7
+            bgcolor = BG1 if rank % 2 != file % 2 else BG2
+            out.append(f'{move_cursor(top + 9 - rank, left + 3 + 3 * file)}'
+                       f'{bgcolor} {piece or " "} {RESET_STYLE}')
+
+    def _draw_captured(self, out):
+        for color, row in ((COLOR.white, self.top), (COLOR.black, self.top + LOG_ROWS - 1)):
+            captured, drawn = self.game.captured[color], self._captured[color]
+            for i in range(max(len(captured), len(drawn))):
+                piece = captured[i] if i < len(captured) else None
+                if i < len(drawn) and piece is drawn[i]:
+                    continue
+                out.append(f'{move_cursor(row, self.left + 3 + i)}{BG2}{piece or " "}'
+                           f'{RESET_STYLE}')
+            self._captured[color] = list(captured)
+
+    def _draw_log(self, out):
+        log = self.game.moves
+        # the column is filled a page at a time rather than scrolled, so that a move
+        # only adds a row
+        first = max(0, len(log) - 1) // LOG_ROWS * LOG_ROWS
+        texts = {}
+        for move_id in range(first, len(log)):
+            # a move taken back and replaced by another has the same move_id
+            code = (log.codes[move_id], log.details[move_id])
+            cached = self._moves.get(move_id)
+            texts[move_id] = cached if cached and cached[0] == code else (
+                code, move_text(log[move_id]))
+        self._moves = texts
+
+        column = self.left + 30
+        for i in range(LOG_ROWS):
+            move_id = first + i
+            text = (f'{BG2}{texts[move_id][1]}{RESET_STYLE}' if move_id in texts else
+                    BLANK_LOG_ROW)
+            if text != self._log_rows[i]:
+                self._log_rows[i] = text
+                out.append(move_cursor(self.top + i, column) + text)
@@ -0,0 +1,175 @@
+"""Hosting games over a line protocol on TCP or Unix sockets with asyncio.
+
+A client sends commands of words separated by spaces, one per line, and gets a line
+back for each, in order, starting with 'ok' or 'error':
+
+    new [FEN]                       ok GAME
+    move GAME FROM TO               ok STATUS, '-', 'check', 'mate' or 'stalemate'
+    moves GAME                      ok MOVE...  the legal moves, like e2e4
+    fen GAME                        ok FEN
+    eval GAME                       ok SCORE    centipawns, positive when white is better
+    search GAME [DEPTH [SECONDS]]   ok MOVE SCORE DEPTH
+    close GAME                      ok
+    quit                            closes the connection
+
+Errors are 'error NAME MESSAGE', NAME being the exception raised, like IllegalMove.
+
+The games are played on the event loop, a move taking tens of microseconds. Engine
+searches run in a process pool on a snapshot of the game, so that they don't hold up
+the other games."""
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from .game import Chess
+from .player import Player
+from .colors import COLOR, side_of
+from .bitboard import SQUARES, SQUARE_NAMES
+from .movegen import legal_moves
+from .move import CHECK, MATE, STALEMATE
+from .legality import move_error
+from .engine import worker_engine
+from .evaluation import Evaluator
+
+STATUS_NAMES = {0: '-', CHECK: 'check', MATE: 'mate', STALEMATE: 'stalemate'}
+
+def _search(snapshot, depth, time_limit):
+    return worker_engine().search(Chess(snapshot), depth=depth, time_limit=time_limit)
+
+class CommandError(Exception):
+    """A command couldn't be understood"""
+
+class GameServer(object):
+    """Hosts any number of games for the clients connected to it. The games are
+    numbered from 1 on and shared between the connections."""
+    def __init__(self, workers=None, search_depth=4, search_time=1.0):
+        self.games = {}
+        self.workers = workers or os.cpu_count() or 1
+        self.search_depth = search_depth # the most a search command can ask for
+        self.search_time = search_time
+        self.executor = None # started with the first search
+        self.evaluator = Evaluator() # its pawn table is shared by the games
+        self._next_id = 1
+        # commands with the least and the most arguments they take
+        self._commands = {
+            'new': (self.new, 0, 6),
+            'move': (self.move, 3, 3),
+            'moves': (self.moves, 1, 1),
+            'fen': (self.fen, 1, 1),
+            'eval': (self.evaluate, 1, 1),
+            'search': (self.search, 1, 3),
+            'close': (self.close, 1, 1),
+        }
+
+    async def start_tcp(self, host='127.0.0.1', port=0):
+        """Listen on a TCP port and return the asyncio server"""
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def start_unix(self, path):
+        """Listen on a Unix socket and return the asyncio server"""
+        return await asyncio.start_unix_server(self.handle, path)
+
+    async def handle(self, reader, writer):
+        """Serve the commands of a connection until it's closed or sends quit"""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                args = line.decode(errors='replace').split()
+                if args == ['quit']:
+                    break
+                writer.write((await self.execute(args) + '\n').encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def execute(self, args):
+        """The reply to a command given as a list of words"""
+        try:
+            if not args or args[0] not in self._commands:
+                raise CommandError(f'Unknown command {args[0] if args else ""!r}')
+            command, least, most = self._commands[args[0]]
+            if not least <= len(args) - 1 <= most:
+                raise CommandError(f'Wrong number of arguments for {args[0]}')
+            reply = command(*args[1:])
+            if asyncio.iscoroutine(reply):
+                reply = await reply
+        except Exception as e: # pylint: disable=broad-except
+            return f'error {e.__class__.__name__} {e}'
+        return 'ok' if reply is None or reply == '' else f'ok {reply}'
+
+    def game(self, game_id):
+        """The game numbered game_id"""
+        try:
+            return self.games[int(game_id)]
+        except (ValueError, KeyError):
+            raise CommandError(f'No game {game_id}') from None
+
+    def new(self, *fen):
+        """Start a game from the starting position or a position in FEN, between two
+        players of the server"""
+        game = Chess.from_fen(' '.join(fen)) if fen else Chess()
+        game.add_player(Player(COLOR.white))
+        game.add_player(Player(COLOR.black))
+        game.start()
+        # the status of a move is asked for with the reply, see move()
+        game.detect_game_end = False
+        game_id = self._next_id
+        self._next_id += 1
+        self.games[game_id] = game
+        return game_id
+
+    def move(self, game_id, move_from, move_to):
+        """Move the piece at move_from to move_to, for whoever's turn it is"""
+        game = self.game(game_id)
+        piece = game.board.grid.pieces[SQUARES[move_from]] if move_from in SQUARES else None
+        if piece is None:
+            reason = game.check_move(move_from, move_to).reason
+            raise move_error(game, reason, None, move_from)
+        game.move(piece, move_to)
+        return STATUS_NAMES[game.status()]
+
+    def moves(self, game_id):
+        """The legal moves of the side to move"""
+        game = self.game(game_id)
+        side = side_of(game.turn)
+        return ' '.join(SQUARE_NAMES[square] + SQUARE_NAMES[target]
+                        for square, target in legal_moves(game, side))
+
+    def fen(self, game_id):
+        """The position of the game in FEN"""
+        return self.game(game_id).fen()
+
+    def evaluate(self, game_id):
+        """The static evaluation of the position, with the pawn structure"""
+        return self.evaluator(self.game(game_id))
+
+    async def search(self, game_id, depth=None, seconds=None):
+        """Search for the best move in a worker process"""
+        game = self.game(game_id)
+        depth = min(int(depth), self.search_depth) if depth else self.search_depth
+        seconds = min(float(seconds), self.search_time) if seconds else self.search_time
+        if self.executor is None:
+            # forked workers would hold on to the sockets of the connections open at
+            # the time, so that closing them wouldn't close the connections
+            self.executor = ProcessPoolExecutor(
+                self.workers, mp_context=multiprocessing.get_context('spawn'))
+        result = await asyncio.get_running_loop().run_in_executor(
+            self.executor, _search, game.snapshot(), depth, seconds)
+        if result.move is None:
+            return f'- {result.score} {result.depth}'
+        return f'{"".join(result.move)} {result.score} {result.depth}'
+
+    def close(self, game_id):
+        """Forget the game"""
+        self.game(game_id)
+        del self.games[int(game_id)]
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
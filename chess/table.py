@@ -0,0 +1,29 @@
+"""Hash tables of a fixed number of slots"""
+
+class SlotTable(object):
+    """Entries by 64-bit key in a fixed number of slots, each entry being a tuple
+    starting with its key. The slot of a key is its lowest bits, so two keys sharing a
+    slot replace each other's entries, as the subclasses decide."""
+    def __init__(self, size):
+        # round up to a power of 2 so that the slot is a mask of the key
+        size = 1 << max(size - 1, 1).bit_length()
+        self.mask = size - 1
+        self.slots = [None] * size
+
+    def entry(self, key):
+        """The entry stored for the key, or None"""
+        entry = self.slots[key & self.mask]
+        if entry is not None and entry[0] == key:
+            return entry
+        return None
+
+    def put(self, entry):
+        """Store the entry in the slot of its key, replacing the one there"""
+        self.slots[entry[0] & self.mask] = entry
+
+    def clear(self):
+        """Forget all entries"""
+        self.slots = [None] * len(self.slots)
+
+    def __len__(self):
+        return sum(1 for entry in self.slots if entry is not None)
@@ -0,0 +1,156 @@
+"""Positions as arrays of planes for machine learning, made with NumPy, which is only
+needed by this module.
+
+A position is 14 planes of 8 by 8, indexed by rank then file from a1:
+
+    0-5    white pawns, knights, bishops, rooks, queens and king
+    6-11   black pawns, knights, bishops, rooks, queens and king
+    12     ones if black is to move, zeros if white is
+    13     the en passant square, the square a pawn skipped on the previous move
+
+The planes are made from the bitboards of the grid, or from the placement bytes of
+Position snapshots, for whole batches at a time rather than square by square."""
+from .bitboard import BLACK, FULL
+from .colors import side_of
+from .game import Chess
+from .position import Position
+from .pgn import read_games, parse_san
+from .exceptions import IllegalMove, InvalidFen
+
+try:
+    import numpy
+except ImportError: # pragma: no cover
+    numpy = None
+
+PLANES = 14
+PIECE_PLANES = 12
+SIDE_TO_MOVE = 12
+EN_PASSANT = 13
+
+def _require_numpy():
+    if numpy is None:
+        raise ImportError('NumPy is needed to make arrays of positions')
+
+def bitboards(position):
+    """The 14 planes of a Chess game or a BoardView as bitboards"""
+    if isinstance(position, Chess):
+        grid = position.board.grid
+        colors, kinds, turn = grid.colors, grid.kinds, position.turn
+    else:
+        colors, kinds, turn = position.colors, position.kinds, position.turn
+    white, black = colors
+    return [white & kinds[0], white & kinds[1], white & kinds[2], white & kinds[3],
+            white & kinds[4], white & kinds[5],
+            black & kinds[0], black & kinds[1], black & kinds[2], black & kinds[3],
+            black & kinds[4], black & kinds[5],
+            FULL if side_of(turn) == BLACK else 0,
+            0 if position.en_passant is None else 1 << position.en_passant]
+
+def bitboard_array(positions):
+    """Array of shape (N, 14) of uint64 of the bitboards of a sequence of Chess games,
+    BoardViews or Position snapshots"""
+    _require_numpy()
+    rows = [_snapshot_bitboards(position) if isinstance(position, Position) else
+            bitboards(position) for position in positions]
+    return numpy.array(rows, dtype='<u8').reshape(-1, PLANES)
+
+def bitboards_to_planes(rows, out=None):
+    """Array of shape (N, 14, 8, 8) of uint8 from N lists of 14 bitboards, or an
+    array of shape (N, 14) of them"""
+    _require_numpy()
+    boards = numpy.array(rows, dtype='<u8').reshape(-1, PLANES)
+    bits = numpy.unpackbits(boards.view(numpy.uint8), axis=1, bitorder='little')
+    planes = bits.reshape(-1, PLANES, 8, 8)
+    if out is None:
+        return planes
+    out[...] = planes
+    return out
+
+def snapshots_to_planes(snapshots, out=None):
+    """Array of shape (N, 14, 8, 8) of uint8 from N Position snapshots"""
+    _require_numpy()
+    if out is None:
+        out = numpy.zeros((len(snapshots), PLANES, 8, 8), numpy.uint8)
+    else:
+        out[...] = 0
+    if not snapshots:
+        return out
+    codes = numpy.frombuffer(b''.join(s.placement for s in snapshots), numpy.uint8)
+    codes = codes.reshape(-1, 1, 64)
+    # a piece code is 1 + 6 * side + kind, the plane of the piece + 1
+    pieces = codes == numpy.arange(1, PIECE_PLANES + 1, dtype=numpy.uint8).reshape(1, -1, 1)
+    out[:, :PIECE_PLANES] = pieces.reshape(-1, PIECE_PLANES, 8, 8)
+    out[:, SIDE_TO_MOVE] = numpy.array([s.side == BLACK for s in snapshots],
+                                       numpy.uint8).reshape(-1, 1, 1)
+    for i, snapshot in enumerate(snapshots):
+        if snapshot.en_passant is not None:
+            out[i, EN_PASSANT, snapshot.en_passant >> 3, snapshot.en_passant & 7] = 1
+    return out
+
+def to_planes(positions, out=None):
+    """Array of shape (N, 14, 8, 8) of uint8 from a sequence of Chess games, BoardViews
+    or Position snapshots, filled into `out` if it's given"""
+    _require_numpy()
+    positions = list(positions)
+    if all(isinstance(position, Position) for position in positions):
+        return snapshots_to_planes(positions, out)
+    return bitboards_to_planes(bitboard_array(positions), out)
+
+def _snapshot_bitboards(snapshot):
+    boards = [0] * PLANES
+    for square, code in enumerate(snapshot.placement):
+        if code:
+            boards[code - 1] |= 1 << square
+    boards[SIDE_TO_MOVE] = FULL if snapshot.side == BLACK else 0
+    if snapshot.en_passant is not None:
+        boards[EN_PASSANT] = 1 << snapshot.en_passant
+    return boards
+
+def archive_planes(source, chunk_size=65536):
+    """Generate arrays of shape (N, 14, 8, 8) of the positions of the games of a PGN
+    archive, given as a path or a file object, from the first position of each game
+    to the last, `chunk_size` positions at a time. A game stops at its first illegal
+    move, and games with an invalid FEN tag are skipped."""
+    _require_numpy()
+    rows = []
+    for pgngame in read_games(source, resolve=False):
+        try:
+            headers = pgngame.headers
+            game = Chess.from_fen(headers['FEN']) if 'FEN' in headers else Chess()
+        except InvalidFen:
+            continue
+        rows.append(bitboards(game))
+        try:
+            for san in pgngame.moves:
+                game.push(parse_san(game, san))
+                rows.append(bitboards(game))
+        except IllegalMove:
+            pass
+        while len(rows) >= chunk_size:
+            yield bitboards_to_planes(rows[:chunk_size])
+            del rows[:chunk_size]
+    if rows:
+        yield bitboards_to_planes(rows)
+
+def save_chunks(chunks, prefix):
+    """Write each array of `chunks` to its own .npy file, prefix-00000.npy,
+    prefix-00001.npy and so on, and return the paths"""
+    _require_numpy()
+    paths = []
+    for number, chunk in enumerate(chunks):
+        path = f'{prefix}-{number:05}.npy'
+        numpy.save(path, chunk)
+        paths.append(path)
+    return paths
+
+def save_memmap(positions, path, chunk_size=65536):
+    """Write the planes of a sequence of positions to a .npy file through a memory map,
+    `chunk_size` positions at a time, and return the memory map"""
+    _require_numpy()
+    array = numpy.lib.format.open_memmap(path, mode='w+', dtype=numpy.uint8,
+                                         shape=(len(positions), PLANES, 8, 8))
+    for start in range(0, len(positions), chunk_size):
+        chunk = positions[start:start + chunk_size]
+        to_planes(chunk, array[start:start + len(chunk)])
+    array.flush()
+    return array
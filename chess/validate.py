@@ -0,0 +1,65 @@
+"""Validating archives of games in PGN across worker processes"""
+import os
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from .colors import COLOR
+from .move import MATE, STALEMATE
+from .pgn import read_games, replay
+
+GameReport = namedtuple('GameReport', (
+    'number', 'headers', 'legal', 'bad_ply', 'error', 'moves', 'result', 'outcome',
+    'position_key'))
+GameReport.__doc__ = """The validation of a game: its number in the archive from 1 on,
+its tag pairs, whether all of its moves are legal, the ply of the first move that
+isn't (0 for an invalid FEN tag) and why, the number of legal moves, the result given
+in the archive, the result of the final position ('1-0', '0-1', '1/2-1/2' or '*' if it
+isn't over) and the position key of the final position"""
+
+def validate_game(number, game):
+    """Replay a PgnGame read without resolving its moves and return a GameReport"""
+    chess, moves, error = replay(game.headers, game.moves)
+    if chess is None:
+        return GameReport(number, game.headers, False, 0, error, 0, game.result, '*', None)
+    outcome = '*'
+    status = chess.status()
+    if status == STALEMATE:
+        outcome = '1/2-1/2'
+    elif status == MATE:
+        outcome = '1-0' if chess.turn == COLOR.black else '0-1'
+    return GameReport(number, game.headers, error is None,
+                      None if error is None else len(moves) + 1, error, len(moves),
+                      game.result, outcome, chess.position_key())
+
+def _validate_batch(first_number, games):
+    return [validate_game(number, game) for number, game in enumerate(games, first_number)]
+
+def validate_games(source, workers=None, batch_size=64):
+    """Generate a GameReport for each game of a PGN archive, given as a path or a file
+    object, in the order of the archive. The games are parsed in this process and
+    replayed in batches of `batch_size` by `workers` processes, 1 meaning this process.
+    Only a few batches per worker are in flight at a time, so that memory use doesn't
+    depend on the size of the archive."""
+    workers = workers or os.cpu_count() or 1
+    games = read_games(source, resolve=False)
+    if workers == 1:
+        for number, game in enumerate(games, 1):
+            yield validate_game(number, game)
+        return
+
+    with ProcessPoolExecutor(workers) as executor:
+        pending = deque()
+        number = 1
+        batch = []
+        for game in games:
+            batch.append(game)
+            if len(batch) < batch_size:
+                continue
+            pending.append(executor.submit(_validate_batch, number, batch))
+            number += len(batch)
+            batch = []
+            if len(pending) > 2 * workers:
+                yield from pending.popleft().result()
+        if batch:
+            pending.append(executor.submit(_validate_batch, number, batch))
+        while pending:
+            yield from pending.popleft().result()
@@ -0,0 +1,67 @@
+"""Read-only copies of the board for threads other than the one playing the game.
+
+The game changes its grid in place while a move is made, so a thread reading the grid
+at the same time can see a position that's half way through the move. Instead, after
+the game starts and after each move it commits, the game makes a BoardView and
+replaces Chess.view with it. A view is never changed after it's made, so any number of
+threads can query the latest one while the game goes on:
+
+    view = game.view # a single read, the view stays the same after that
+    targets = view.piece_moves('e2')
+
+Views only change when the game starts and when Chess.move() commits a move, not with
+push() and pop(), so a search on the game doesn't disturb them."""
+from collections import namedtuple
+from .board import Grid
+from .colors import COLOR, side_of
+from .bitboard import KING, SQUARES, SQUARE_NAMES, lowest_square
+from .movegen import grid_legal_moves
+
+class BoardView(namedtuple('BoardView', (
+        'pieces', 'colors', 'kinds', 'occupied', 'en_passant', 'turn', 'ply'))):
+    """The pieces by square, the bitboards of a Grid as tuples, the en passant square,
+    whose turn it is (None before the game starts) and the number of moves made. It
+    has the attacks() and attackers() of a Grid, so the move generator can work on it
+    like it does on the grid of the game."""
+    __slots__ = ()
+    attack_map = None # attacks are computed from the bitboards
+    attacks = Grid.attacks
+    attackers = Grid.attackers
+
+    @classmethod
+    def of(cls, game):
+        """View of the current position of the game"""
+        grid = game.board.grid
+        return cls(tuple(grid.pieces), tuple(grid.colors), tuple(grid.kinds), grid.occupied,
+                   game.en_passant, game.turn, len(game.moves))
+
+    def legal_moves(self, color=None):
+        """All legal moves of color, by default the color whose turn it is, as
+        (from, to) pairs of positions"""
+        side = side_of(color or self.turn or COLOR.white)
+        return [(SQUARE_NAMES[s], SQUARE_NAMES[t])
+                for s, t in grid_legal_moves(self, self.en_passant, side)]
+
+    def piece_moves(self, position):
+        """Positions the piece at position can legally move to, whoever's turn it is,
+        or an empty list if there's no piece"""
+        square = SQUARES.get(position)
+        piece = None if square is None else self.pieces[square]
+        if piece is None:
+            return []
+        return [SQUARE_NAMES[t]
+                for _, t in grid_legal_moves(self, self.en_passant, piece.side, 1 << square)]
+
+    def can_move(self, move_from, move_to):
+        """If the piece at move_from can legally move to move_to, whoever's turn it is"""
+        return move_to in self.piece_moves(move_from)
+
+    def is_in_check(self, color):
+        """Check if color's king is attacked"""
+        side = side_of(color)
+        king = self.kinds[KING] & self.colors[side]
+        return bool(king) and bool(self.attackers(lowest_square(king), side ^ 1))
+
+    def piece_at(self, position):
+        """The piece at position, or None"""
+        return self.pieces[SQUARES[position]]
@@ -0,0 +1,12 @@
+"""Zobrist keys. A position is hashed by XORing together a random 64-bit key for
+each piece on its square, plus keys for the side to move and the en passant file.
+The keys are generated from a fixed seed, so hashes are the same across runs and
+processes."""
+import random
+
+_random = random.Random(0x5EED)
+
+# PIECE_KEYS[side][kind][square]
+PIECE_KEYS = [[[_random.getrandbits(64) for _ in range(64)] for _ in range(6)] for _ in range(2)]
+BLACK_TO_MOVE = _random.getrandbits(64)
+EN_PASSANT_KEYS = [_random.getrandbits(64) for _ in range(8)]
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""Export the positions of PGN archives as arrays of planes for machine learning, see
+chess.tensors. Each chunk of positions is written to its own .npy file."""
+import argparse
+import sys
+import time
+from chess.tensors import archive_planes, save_chunks
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('files', nargs='+', metavar='file', help='PGN files')
+    parser.add_argument('-o', '--prefix', default='positions',
+                        help='the files written are PREFIX-00000.npy and so on, '
+                             '%(default)s by default')
+    parser.add_argument('-c', '--chunk-size', type=int, default=65536,
+                        help='positions per file, %(default)s by default')
+    args = parser.parse_args()
+
+    positions = 0
+    started = time.perf_counter()
+    def chunks():
+        nonlocal positions
+        for path in args.files:
+            for chunk in archive_planes(path, args.chunk_size):
+                positions += len(chunk)
+                yield chunk
+    paths = save_chunks(chunks(), args.prefix)
+    elapsed = time.perf_counter() - started
+    print(f'{positions} positions in {len(paths)} files in {elapsed:.3f}s, '
+          f'{positions / max(elapsed, 1e-9):.0f} positions/s', file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
 """Hot seat example"""
+import sys
 from chess import Chess, Player
 from chess.colors import COLOR
-import os
+from chess.render import TerminalRenderer
 
 def main():
     game = Chess()
@@ -15,19 +16,20 @@ def main():
     player1.game.turn = player1.color
     players = [player1, player2]
 
+    renderer = TerminalRenderer(game)
+    message = ''
     turn = 0
     while True:
+        player = players[turn]
+        # only the squares and moves that changed are redrawn
+        sys.stdout.write(renderer.frame() + renderer.footer(message))
+        sys.stdout.flush()
         try:
-            os.system('clear')
-            player = players[turn]
-            print(player.game)
             player.move(*input(f'{player.color.name} move: ').split())
             turn = not turn
+            message = ''
         except Exception as e:
-            os.system('clear')
-            print(f'{e.__class__.__name__}: {e}')
-            input('Press return to continue...')
-            continue
+            message = f'{e.__class__.__name__}: {e}'
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Load generator for the game server. Opens connections that play random games, each
+connection alternating between its games, and reports the moves per second and the
+latency of the move commands."""
+import argparse
+import asyncio
+import random
+import time
+
+async def command(reader, writer, line):
+    writer.write(line.encode() + b'\n')
+    await writer.drain()
+    reply = (await reader.readline()).decode().split()
+    if not reply or reply[0] != 'ok':
+        raise RuntimeError(f'{line}: {" ".join(reply)}')
+    return reply[1:]
+
+async def client(args, number, deadline, latencies):
+    if args.unix:
+        reader, writer = await asyncio.open_unix_connection(args.unix)
+    else:
+        reader, writer = await asyncio.open_connection(args.host, args.port)
+    rnd = random.Random(number)
+    games = [(await command(reader, writer, 'new'))[0] for _ in range(args.games)]
+    plies = dict.fromkeys(games, 0)
+    try:
+        while time.perf_counter() < deadline:
+            for i, game in enumerate(games):
+                moves = await command(reader, writer, f'moves {game}')
+                if not moves or plies[game] >= args.plies:
+                    await command(reader, writer, f'close {game}')
+                    game = games[i] = (await command(reader, writer, 'new'))[0]
+                    plies[game] = 0
+                    continue
+                move = rnd.choice(moves)
+                started = time.perf_counter()
+                await command(reader, writer, f'move {game} {move[:2]} {move[2:]}')
+                latencies.append(time.perf_counter() - started)
+                plies[game] += 1
+    finally:
+        writer.write(b'quit\n')
+        writer.close()
+
+async def run(args):
+    latencies = []
+    started = time.perf_counter()
+    await asyncio.gather(*(client(args, number, started + args.seconds, latencies)
+                           for number in range(args.connections)))
+    return latencies, time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--host', default='127.0.0.1', help='%(default)s by default')
+    parser.add_argument('-p', '--port', type=int, default=7777, help='%(default)s by default')
+    parser.add_argument('-u', '--unix', metavar='PATH', help='connect to a Unix socket')
+    parser.add_argument('-c', '--connections', type=int, default=10,
+                        help='%(default)s by default')
+    parser.add_argument('-g', '--games', type=int, default=10,
+                        help='games per connection, %(default)s by default')
+    parser.add_argument('--plies', type=int, default=200,
+                        help='longest game before starting a new one, %(default)s by default')
+    parser.add_argument('-t', '--seconds', type=float, default=10,
+                        help='duration of the run, %(default)s by default')
+    args = parser.parse_args()
+
+    latencies, elapsed = asyncio.run(run(args))
+    latencies.sort()
+    print(f'{len(latencies)} moves in {elapsed:.3f}s, {len(latencies) / elapsed:.0f} moves/s, '
+          f'{args.connections * args.games} games')
+    if latencies:
+        for name, quantile in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99), ('p99.9', 0.999)):
+            index = min(len(latencies) - 1, int(quantile * len(latencies)))
+            print(f'{name:>6} {latencies[index] * 1000:8.3f} ms')
+        print(f'{"max":>6} {latencies[-1] * 1000:8.3f} ms')
+
+if __name__ == '__main__':
+    main()
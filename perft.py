@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Move generation benchmark. Counts the moves from the positions of chess.perft and
+checks the counts."""
+import argparse
+import time
+from chess import Chess
+from chess.perft import POSITIONS, PerftTable
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('positions', nargs='*', metavar='position',
+                        help='names of the positions, all of them by default: %s' %
+                        ', '.join(name for name, _, _ in POSITIONS))
+    parser.add_argument('-d', '--depth', type=int, default=3,
+                        help='number of moves to count, %(default)s by default')
+    parser.add_argument('--hash', type=int, default=0, metavar='SIZE',
+                        help='cache counts in a table of SIZE slots')
+    parser.add_argument('--divide', action='store_true',
+                        help='print the count of each move')
+    args = parser.parse_args()
+
+    positions = [p for p in POSITIONS if not args.positions or p[0] in args.positions]
+    total_nodes, total_time, failed = 0, 0.0, False
+    for name, position, counts in positions:
+        game = Chess.from_fen(position)
+        table = PerftTable(args.hash) if args.hash else None
+        started = time.perf_counter()
+        if args.divide:
+            divided = game.divide(args.depth, table)
+            nodes = sum(divided.values())
+        else:
+            nodes = game.perft(args.depth, table)
+        elapsed = time.perf_counter() - started
+        total_nodes += nodes
+        total_time += elapsed
+
+        if args.divide:
+            for (move_from, move_to), count in sorted(divided.items()):
+                print(f'{move_from}{move_to}: {count}')
+        expected = counts[args.depth - 1] if 0 < args.depth <= len(counts) else None
+        status = '' if expected is None else 'ok' if nodes == expected else f'FAIL, expected {expected}'
+        failed = failed or bool(expected is not None and nodes != expected)
+        print(f'{name:10} depth {args.depth} {nodes:10} nodes {elapsed:8.3f}s '
+              f'{nodes / max(elapsed, 1e-9):10.0f} nodes/s {status}')
+
+    print(f'{"total":10} depth {args.depth} {total_nodes:10} nodes {total_time:8.3f}s '
+          f'{total_nodes / max(total_time, 1e-9):10.0f} nodes/s')
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""PGN reading benchmark. Streams the games of PGN files, resolving their moves, and
+reports the throughput and the peak memory use. Without files, an archive of random
+games is generated first."""
+import argparse
+import os
+import random
+import resource
+import tempfile
+import time
+from chess import Chess
+from chess.movegen import legal_moves
+from chess.pgn import read_games, format_san
+
+def generate(file, games, seed=0):
+    """Write random games of up to 200 plies"""
+    rnd = random.Random(seed)
+    for number in range(games):
+        game = Chess()
+        tokens = []
+        for ply in range(rnd.randint(20, 200)):
+            moves = list(legal_moves(game, ply & 1))
+            if not moves:
+                break
+            move = rnd.choice(moves)
+            if not ply & 1:
+                tokens.append(f'{ply // 2 + 1}.')
+            tokens.append(format_san(game, move))
+            game.push(move)
+        file.write(f'[Event "Random game {number + 1}"]\n[Result "*"]\n\n')
+        file.write(' '.join(tokens) + ' *\n\n')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('files', nargs='*', metavar='file', help='PGN files')
+    parser.add_argument('-g', '--generate', type=int, default=1000, metavar='GAMES',
+                        help='number of random games without files, %(default)s by default')
+    parser.add_argument('--no-resolve', action='store_true',
+                        help="only parse the games, don't resolve the moves")
+    args = parser.parse_args()
+
+    files, archive = args.files, None
+    if not files:
+        archive = tempfile.NamedTemporaryFile('w', suffix='.pgn', delete=False)
+        with archive:
+            generate(archive, args.generate)
+        files = [archive.name]
+
+    games = moves = errors = 0
+    started = time.perf_counter()
+    try:
+        for path in files:
+            for game in read_games(path, resolve=not args.no_resolve):
+                games += 1
+                moves += len(game.moves)
+                errors += game.error is not None
+    finally:
+        if archive:
+            os.remove(archive.name)
+    elapsed = time.perf_counter() - started
+
+    # kilobytes on Linux
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f'{games} games, {moves} moves, {errors} unresolved in {elapsed:.3f}s')
+    print(f'{games / max(elapsed, 1e-9):.0f} games/s, {moves / max(elapsed, 1e-9):.0f} moves/s, '
+          f'peak memory {peak / 1024:.1f} MiB')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""Chess game server. Hosts games for clients sending commands over a line protocol,
+see chess.server."""
+import argparse
+import asyncio
+from chess.server import GameServer
+
+async def serve(args):
+    server = GameServer(args.workers, args.search_depth, args.search_time)
+    if args.unix:
+        listener = await server.start_unix(args.unix)
+        print(f'Listening on {args.unix}', flush=True)
+    else:
+        listener = await server.start_tcp(args.host, args.port)
+        host, port = listener.sockets[0].getsockname()[:2]
+        print(f'Listening on {host}:{port}', flush=True)
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.shutdown()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--host', default='127.0.0.1', help='%(default)s by default')
+    parser.add_argument('-p', '--port', type=int, default=7777, help='%(default)s by default')
+    parser.add_argument('-u', '--unix', metavar='PATH',
+                        help='listen on a Unix socket instead of a TCP port')
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help='number of search processes, one per CPU by default')
+    parser.add_argument('--search-depth', type=int, default=4,
+                        help='deepest search allowed, %(default)s by default')
+    parser.add_argument('--search-time', type=float, default=1.0,
+                        help='longest search allowed in seconds, %(default)s by default')
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
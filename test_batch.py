@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Testing"""
+import random
+from chess import Chess
+from chess.perft import POSITIONS
+from chess.bitboard import WHITE, BLACK
+from chess.colors import COLOR
+from chess.movegen import legal_moves
+from chess.batch import attack_masks, in_check, legal_move_counts
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def random_positions(count, seed=1):
+    generator = random.Random(seed)
+    games = []
+    for _, fen, _ in POSITIONS:
+        for _ in range(count):
+            game = Chess.from_fen(fen)
+            for _ in range(generator.randrange(80)):
+                side = BLACK if game.turn == COLOR.black else WHITE
+                moves = list(legal_moves(game, side))
+                if not moves:
+                    break
+                game.push(generator.choice(moves))
+            games.append(game)
+    return games
+
+def test_batch():
+    if numpy is None:
+        return
+    games = random_positions(25)
+    # en passant pinned along a rank, and out of check
+    games += [Chess.from_fen('8/8/8/KPp4r/8/8/8/7k w - c6 0 1'),
+              Chess.from_fen('8/8/3k4/8/2pP4/8/8/3K1B2 b - d3 0 1')]
+    counts = legal_move_counts([game.snapshot() for game in games])
+    checks = in_check(games)
+    masks = attack_masks(games)
+    for game, count, check, mask in zip(games, counts, checks, masks):
+        side = BLACK if game.turn == COLOR.black else WHITE
+        assert count == len(list(legal_moves(game, side))), game.fen()
+        assert check == game.is_in_check(game.turn), game.fen()
+        grid = game.board.grid
+        attacked = [0, 0]
+        for square, piece in enumerate(grid.pieces):
+            if piece:
+                attacked[piece.side] |= grid.attacks(square)
+        assert attacked == [int(mask[WHITE]), int(mask[BLACK])], game.fen()
+
+def main():
+    test_batch()
+
+if __name__ == '__main__':
+    main()
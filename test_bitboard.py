@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Testing"""
+from chess import Chess
+from chess.bitboard import (
+    WHITE,
+    BLACK,
+    FULL,
+    KNIGHT_ATTACKS,
+    KING_ATTACKS,
+    PAWN_ATTACKS,
+    BETWEEN,
+    SQUARES,
+    iter_bits,
+    rook_attacks,
+    bishop_attacks,
+    queen_attacks,
+)
+
+def _on_board(x, y):
+    return 0 <= x < 8 and 0 <= y < 8
+
+def _squares(coordinates):
+    bitboard = 0
+    for x, y in coordinates:
+        bitboard |= 1 << (y * 8 + x)
+    return bitboard
+
+def _leaps(square, steps):
+    x, y = square & 7, square >> 3
+    return _squares((x + dx, y + dy) for dx, dy in steps if _on_board(x + dx, y + dy))
+
+def _line(square, dx, dy, occupied):
+    """Coordinates along a direction up to and including the first occupied square"""
+    x, y = (square & 7) + dx, (square >> 3) + dy
+    while _on_board(x, y):
+        yield x, y
+        if occupied >> (y * 8 + x) & 1:
+            break
+        x, y = x + dx, y + dy
+
+def _slides(square, steps, occupied):
+    return _squares(c for dx, dy in steps for c in _line(square, dx, dy, occupied))
+
+KNIGHT = ((1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2))
+KING = ((0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1), (-1, 0), (-1, 1))
+ORTHOGONAL = ((0, 1), (1, 0), (0, -1), (-1, 0))
+DIAGONAL = ((1, 1), (1, -1), (-1, -1), (-1, 1))
+
+def test_leaper_tables():
+    for square in range(64):
+        assert KNIGHT_ATTACKS[square] == _leaps(square, KNIGHT), square
+        assert KING_ATTACKS[square] == _leaps(square, KING), square
+        assert PAWN_ATTACKS[WHITE][square] == _leaps(square, ((-1, 1), (1, 1))), square
+        assert PAWN_ATTACKS[BLACK][square] == _leaps(square, ((-1, -1), (1, -1))), square
+
+def test_sliders():
+    occupancies = (0, FULL, 0x0000_1824_4281_0000, 0x8100_0000_0000_0081,
+                   0x0042_0000_1000_2400)
+    for occupied in occupancies:
+        for square in range(64):
+            rook = _slides(square, ORTHOGONAL, occupied)
+            bishop = _slides(square, DIAGONAL, occupied)
+            assert rook_attacks(square, occupied) == rook, (square, occupied)
+            assert bishop_attacks(square, occupied) == bishop, (square, occupied)
+            assert queen_attacks(square, occupied) == rook | bishop, (square, occupied)
+
+def test_between():
+    for square1 in range(64):
+        for square2 in range(64):
+            expected = 0
+            for dx, dy in ORTHOGONAL + DIAGONAL:
+                line = list(_line(square1, dx, dy, 1 << square2))
+                if line and line[-1] == (square2 & 7, square2 >> 3):
+                    expected = _squares(line[:-1])
+            assert BETWEEN[square1][square2] == expected, (square1, square2)
+    assert BETWEEN[SQUARES['a1']][SQUARES['h8']] == _squares((i, i) for i in range(1, 7))
+    assert BETWEEN[SQUARES['a1']][SQUARES['b3']] == 0
+
+def _state(grid):
+    return (list(grid.pieces), list(grid.colors), list(grid.kinds), grid.occupied,
+            grid.key, grid.pawn_key, grid.score)
+
+def test_grid_round_trip():
+    game = Chess()
+    grid = game.board.grid
+    start = _state(grid)
+    assert grid.occupied == 0xFFFF_0000_0000_FFFF
+    assert grid.colors[WHITE] == 0xFFFF and grid.colors[BLACK] == 0xFFFF << 48
+    # every piece taken off and put back
+    for square in list(iter_bits(grid.occupied)):
+        piece = grid.remove(square)
+        assert grid.pieces[square] is None
+        assert not grid.occupied >> square & 1
+        assert not (grid.colors[piece.side] | grid.kinds[piece.kind]) >> square & 1
+        assert grid.remove(square) is None
+        grid.put(square, piece)
+        assert _state(grid) == start
+    # a piece put on an empty square, over another piece and taken off again
+    knight = grid.pieces[SQUARES['g1']]
+    pawn = grid.pieces[SQUARES['d7']]
+    grid.put(SQUARES['e4'], knight)
+    assert grid.occupied >> SQUARES['e4'] & 1
+    grid.put(SQUARES['e4'], pawn)
+    assert grid.pieces[SQUARES['e4']] is pawn
+    assert not grid.colors[knight.side] >> SQUARES['e4'] & 1
+    assert grid.remove(SQUARES['e4']) is pawn
+    assert _state(grid) == start
+    # the bitboards of load() are the ones of put()
+    grid.load(start[0])
+    assert _state(grid) == start
+    for square, piece in enumerate(grid.pieces):
+        in_colors = [side for side in (WHITE, BLACK) if grid.colors[side] >> square & 1]
+        in_kinds = [kind for kind in range(6) if grid.kinds[kind] >> square & 1]
+        if piece:
+            assert in_colors == [piece.side] and in_kinds == [piece.kind], square
+        else:
+            assert not in_colors and not in_kinds, square
+
+def main():
+    test_leaper_tables()
+    test_sliders()
+    test_between()
+    test_grid_round_trip()
+
+if __name__ == '__main__':
+    main()
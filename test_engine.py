@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""Testing"""
+import pickle
+from chess import Chess, Player
+from chess.colors import COLOR
+from chess.engine import Engine, ParallelEngine, TranspositionTable, SearchResult
+from chess.engine.parallel import merge_shares
+from chess.position import Position
+from chess.evaluation import evaluate, score_pieces, Evaluator, pawn_structure
+from chess.bitboard import SQUARES
+
+def new_game():
+    game = Chess()
+    game.add_player(Player(COLOR.white))
+    game.add_player(Player(COLOR.black))
+    game.start()
+    return game
+
+def play(game, *moves):
+    for move in moves:
+        old_position, new_position = move.split()
+        game.move(game.board[old_position].piece, new_position)
+
+def test_mate_in_one():
+    game = new_game()
+    play(game, 'f2 f3', 'e7 e5', 'g2 g4')
+    key = game.position_key()
+    result = Engine().search(game, depth=3)
+    assert result.move == ('d8', 'h4')
+    assert result.score > 0
+    assert game.position_key() == key # the game is left as it was
+
+def test_win_material():
+    game = new_game()
+    play(game, 'e2 e4', 'd7 d5', 'd1 g4')
+    result = Engine().search(game, depth=3)
+    assert result.move == ('c8', 'g4')
+
+def test_limits():
+    game = new_game()
+    result = Engine().search(game, node_limit=2000)
+    assert result.move in game.legal_moves()
+    assert result.nodes <= 2100
+
+def test_parallel():
+    game = new_game()
+    play(game, 'f2 f3', 'e7 e5', 'g2 g4')
+    with ParallelEngine(workers=2) as engine:
+        result = engine.search(game, depth=2)
+        assert result.move == ('d8', 'h4')
+        # the share with the mate stops there, the other one goes on deeper
+        result = engine.search(game, depth=3)
+        assert result.move == ('d8', 'h4') and result.score > 0 and result.depth == 1
+
+def test_merge_shares():
+    def iteration(move, score, depth):
+        return SearchResult(move, score, depth, 0, 0.0, [move])
+    deep = [iteration(('e2', 'e4'), 50, 1), iteration(('e2', 'e4'), 10, 2),
+            iteration(('e2', 'e4'), 20, 3)]
+    shallow = [iteration(('d2', 'd4'), 40, 1), iteration(('d2', 'd4'), 15, 2)]
+    # each share counts at its deepest iteration, and a share that didn't complete any
+    # is left out
+    best = merge_shares([(deep, 100), (shallow, 50), ([], 10)])
+    assert best.move == ('e2', 'e4') and best.depth == 3 and best.nodes == 160
+    assert merge_shares([(shallow, 50), ([], 10)]).move == ('d2', 'd4')
+    assert merge_shares([([], 10)]) is None
+
+def test_snapshot():
+    game = new_game()
+    play(game, 'e2 e4', 'a7 a6', 'e4 e5', 'd7 d5')
+    copy = Chess(game.snapshot())
+    assert copy.position_key() == game.position_key()
+    assert sorted(copy.legal_moves()) == sorted(game.legal_moves())
+
+def test_copy():
+    game = new_game()
+    play(game, 'e2 e4', 'd7 d5')
+    position = game.snapshot()
+    assert position == Position.from_fen(game.fen())
+    assert hash(position) == hash(pickle.loads(pickle.dumps(position)))
+    assert not game.is_in_check(COLOR.white) # brings the attack map up to date
+    copy = game.copy()
+    assert copy.started and copy.turn == game.turn
+    assert copy.fen() == game.fen() and copy.position_key() == game.position_key()
+    assert copy.board['e4'].piece is not game.board['e4'].piece
+    assert copy.board['e4'].piece.game is copy
+    assert copy.attackers_of('d5', COLOR.white) == ['e4']
+    play(copy, 'e4 d5')
+    assert copy.attackers_of('d5', COLOR.black) == ['d8']
+    assert game.attackers_of('e4', COLOR.black) == ['d5']
+    assert copy.board['e4'].piece is None
+    assert game.board['e4'].piece is not None
+    assert game.snapshot() == position
+    assert Chess(position).fen() == game.fen()
+
+def test_transposition_table():
+    table = TranspositionTable(1000)
+    assert len(table.slots) == 1024
+    table.store(1, 3, 10, 0, (12, 28))
+    table.store(1025, 2, 20, 0, (12, 20)) # same slot, shallower
+    assert table.get(1) == (3, 10, 0, (12, 28))
+    assert table.get(1025) is None
+    table.new_search()
+    table.store(1025, 2, 20, 0, (12, 20)) # results of earlier searches are replaced
+    assert table.get(1025) == (2, 20, 0, (12, 20))
+
+def test_evaluation():
+    game = new_game()
+    assert evaluate(game) == 0
+    game = Chess.from_fen('k7/6P1/8/3pP3/8/8/8/K7 w - d6 0 1')
+    game.add_player(Player(COLOR.white))
+    game.add_player(Player(COLOR.black))
+    game.start()
+    scores = [evaluate(game)]
+    # en passant, promotion, and a capture of the promoted queen
+    for move in ('e5 d6', 'a8 b7', 'g7 g8', 'b7 c6', 'g8 c8', 'c6 d6', 'c8 c7', 'd6 c7'):
+        play(game, move)
+        assert evaluate(game) == score_pieces(game.board.grid.pieces), move
+        assert evaluate(game, COLOR.black.value - 1) == -evaluate(game)
+        scores.append(evaluate(game))
+    assert scores[3] - scores[2] > 700 and scores[-2] - scores[-1] > 900
+    while game.undo():
+        scores.pop()
+        assert evaluate(game) == scores[-1]
+    result = Engine(evaluate=evaluate).search(game, depth=3)
+    assert result.move == ('g7', 'g8')
+
+def test_pawn_table():
+    game = Chess.from_fen('4k3/p7/8/1P1p4/1P6/8/6P1/4K3 w - - 0 1')
+    evaluator = Evaluator(table_size=16)
+    passed = evaluator.passed_pawns(game)
+    assert passed == 1 << SQUARES['g2'] | 1 << SQUARES['d5']
+    grid = game.board.grid
+    key, score = grid.pawn_key, evaluator(game)
+    # doubled, isolated and passed pawns on both sides
+    assert score == grid.score - 10 - 15 * 2 - 15 + 5 + 15 * 2 - 20
+    game.push((SQUARES['e1'], SQUARES['d2']))
+    assert grid.pawn_key == key and evaluator(game) == grid.score - 40
+    game.push((SQUARES['d5'], SQUARES['d4']))
+    assert grid.pawn_key != key
+    evaluator(game)
+    game.pop()
+    game.pop()
+    assert grid.pawn_key == key and evaluator(game) == score
+    assert (evaluator.pawns.hits, evaluator.pawns.misses) == (3, 2)
+    assert evaluator.pawns.hit_rate == 0.6
+    white = grid.kinds[0] & grid.colors[0]
+    assert pawn_structure(white, 0)[1] == white
+
+def main():
+    test_mate_in_one()
+    test_win_material()
+    test_limits()
+    test_parallel()
+    test_merge_shares()
+    test_snapshot()
+    test_copy()
+    test_transposition_table()
+    test_evaluation()
+    test_pawn_table()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Testing"""
+from chess import Chess, Player
+from chess.colors import COLOR
+from chess.exceptions import InvalidFen
+from chess.fen import STARTING_FEN
+
+def test_starting_position():
+    game = Chess()
+    assert game.fen() == STARTING_FEN
+    assert Chess.from_fen(STARTING_FEN).position_key() == game.position_key()
+
+def test_round_trip():
+    game = Chess()
+    game.add_player(Player(COLOR.white))
+    game.add_player(Player(COLOR.black))
+    game.start()
+    for move in ('e2 e4', 'a7 a6', 'e4 e5', 'd7 d5'):
+        old_position, new_position = move.split()
+        game.move(game.board[old_position].piece, new_position)
+    position = 'rnbqkbnr/1pp1pppp/p7/3pP3/8/8/PPPP1PPP/RNBQKBNR w - d6 0 3'
+    assert game.fen() == position
+    copy = Chess.from_fen(position)
+    assert copy.fen() == position
+    assert copy.position_key() == game.position_key()
+    assert 'd6' in copy.board['e5'].piece.legal_moves()
+
+def test_continue_from_fen():
+    game = Chess.from_fen('7k/8/8/8/8/8/8/K6R b - - 12 40')
+    game.add_player(Player(COLOR.white))
+    game.add_player(Player(COLOR.black))
+    game.start()
+    assert game.turn == COLOR.black
+    assert sorted(game.legal_moves()) == [('h8', 'g7'), ('h8', 'g8')]
+    assert Chess.from_fen('7k/8/8/8/8/8/8/K6R b KQkq -').fen() == '7k/8/8/8/8/8/8/K6R b - - 0 1'
+
+def test_invalid():
+    for position in ('', '8/8/8/8/8/8/8 w - - 0 1', '8/8/8/8/8/8/8/7x w - - 0 1',
+                     '8/8/8/8/8/8/8/8 w - e3 0 1', '8/8/8/8/8/8/8/8 w - - 0 0'):
+        try:
+            Chess.from_fen(position)
+            assert False, position
+        except InvalidFen:
+            pass
+
+def main():
+    test_starting_position()
+    test_round_trip()
+    test_continue_from_fen()
+    test_invalid()
+
+if __name__ == '__main__':
+    main()
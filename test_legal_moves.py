@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""Testing"""
+import threading
+from chess import Chess, Player
+from chess.exceptions import GameOver, IllegalMove
+from chess.legality import REASON
+from chess.colors import COLOR
+from chess.movegen import legal_moves
+from chess.move import (
+    move_name, move_flags, is_capture, promotion, DOUBLE_PUSH, EN_PASSANT, MATE,
+    STALEMATE)
+from chess.bitboard import QUEEN
+
+def new_game():
+    game = Chess()
+    game.add_player(Player(COLOR.white))
+    game.add_player(Player(COLOR.black))
+    game.start()
+    return game
+
+def play(game, *moves):
+    for move in moves:
+        old_position, new_position = move.split()
+        game.move(game.board[old_position].piece, new_position)
+
+def test_opening():
+    game = new_game()
+    assert len(game.legal_moves()) == 20
+    assert sorted(game.board['b1'].piece.legal_moves()) == ['a3', 'c3']
+    assert game.board['a1'].piece.legal_moves() == []
+    assert not game.board['a1'].piece.can_move()
+    play(game, 'e2 e4')
+    assert len(game.legal_moves()) == 20
+    assert len(game.legal_moves(COLOR.white)) == 30
+
+def test_en_passant():
+    game = new_game()
+    play(game, 'e2 e4', 'a7 a6', 'e4 e5', 'd7 d5')
+    assert 'd6' in game.board['e5'].piece.legal_moves()
+    play(game, 'a2 a3', 'a6 a5')
+    assert 'd6' not in game.board['e5'].piece.legal_moves()
+
+def test_push_pop():
+    game = new_game()
+    play(game, 'e2 e4', 'a7 a6', 'e4 e5', 'd7 d5')
+    pieces = list(game.board.grid.pieces)
+    state = (game.en_passant, game.halfmove_clock, game.fullmove_number, game.turn)
+    colors = game.board.grid.colors[0], game.board.grid.colors[1]
+    for move in list(legal_moves(game, 0)):
+        game.push(move)
+        game.pop()
+        assert game.board.grid.pieces == pieces
+        assert (game.en_passant, game.halfmove_clock, game.fullmove_number, game.turn) == state
+        assert (game.board.grid.colors[0], game.board.grid.colors[1]) == colors
+    game.push((36, 43)) # e5xd6 en passant
+    assert not game.board['d5'].piece
+    game.pop()
+    assert game.board['d5'].piece
+
+def test_board_move():
+    game = new_game()
+    pawn = game.board['e2'].piece
+    assert game.board.move(pawn, 'e4') is None
+    assert game.board['e4'].piece is pawn and game.board['e2'].piece is None
+    assert pawn.legal_moves() == ['e5'] and game.moves[-1]['move_to'] == 'e4'
+    knight = game.board['b8'].piece
+    assert knight.move('c6', commit=False) is None and game.board['b8'].piece is knight
+    knight.move('c6')
+    play(game, 'e4 e5', 'd7 d5')
+    black_pawn = game.board['d5'].piece
+    assert game.board['e5'].piece.move('d6') is black_pawn # en passant
+    assert len(game.moves) == 5 and game.board['d5'].piece is None
+
+def test_push_piece_square():
+    game = Chess()
+    game.push((12, 28)) # e2e4
+    pawn = game.board['e4'].piece
+    assert pawn.position == 'e4' and pawn.legal_moves() == ['e5']
+    game.push((62, 45)) # g8f6
+    knight = game.board['f6'].piece
+    assert knight.position == 'f6' and 'g8' in knight.legal_moves()
+    game.pop()
+    game.pop()
+    assert pawn.position == 'e2' and sorted(pawn.legal_moves()) == ['e3', 'e4']
+    assert knight.position == 'g8' and sorted(knight.legal_moves()) == ['f6', 'h6']
+
+def test_position_key():
+    game = new_game()
+    key = game.position_key()
+    play(game, 'g1 f3', 'g8 f6', 'f3 g1', 'f6 g8')
+    assert game.position_key() == key
+    play(game, 'e2 e4')
+    key = game.position_key()
+    for move in list(legal_moves(game, 1)):
+        game.push(move)
+        assert game.position_key() != key
+        game.pop()
+        assert game.position_key() == key
+    play(game, 'a7 a6', 'e4 e5', 'd7 d5')
+    # the same placement without the possibility to capture en passant
+    en_passant_key = game.position_key()
+    play(game, 'g1 f3', 'g8 f6', 'f3 g1', 'f6 g8')
+    assert game.position_key() != en_passant_key
+
+def test_attackers():
+    game = new_game()
+    assert sorted(game.attackers_of('f3', COLOR.white)) == ['e2', 'g1', 'g2']
+    assert game.attackers_of('e4', COLOR.white) == []
+    play(game, 'e2 e4', 'd7 d5', 'f1 b5')
+    assert game.attackers_of('e8', COLOR.white) == ['b5']
+    assert game.is_in_check(COLOR.black)
+    assert not game.is_in_check(COLOR.white)
+    play(game, 'c7 c6')
+    assert not game.is_in_check(COLOR.black)
+    assert game.attackers_of('b5', COLOR.black) == ['c6']
+
+def test_check_evasion():
+    game = new_game()
+    play(game, 'e2 e4', 'd7 d5', 'f1 b5')
+    assert game.board['c7'].piece.legal_moves() == ['c6']
+    assert sorted(game.board['b8'].piece.legal_moves()) == ['c6', 'd7']
+    assert game.board['g8'].piece.legal_moves() == []
+
+def test_fools_mate():
+    game = new_game()
+    play(game, 'f2 f3', 'e7 e5', 'g2 g4')
+    try:
+        play(game, 'd8 h4')
+        assert False
+    except GameOver:
+        pass
+    assert game.moves[-1]['mate']
+    assert game.legal_moves(COLOR.white) == []
+
+def test_lazy_game_end():
+    game = new_game()
+    game.detect_game_end = False
+    play(game, 'f2 f3', 'e7 e5', 'g2 g4', 'd8 h4') # mate isn't detected
+    assert not game.over
+    assert game.status() == MATE
+    assert game.moves[-1]['mate'] and game.moves[1]['check'] is False
+    try:
+        play(game, 'a2 a3')
+        assert False
+    except GameOver:
+        pass
+    assert game.over
+
+    # statuses are worked out again for moves replacing the ones taken back
+    game = new_game()
+    game.detect_game_end = False
+    play(game, 'e2 e4', 'f7 f6', 'd1 h5')
+    assert game.moves[-1]['check'] and not game.moves[0]['check']
+    game.undo()
+    play(game, 'a2 a3')
+    assert not game.moves[-1]['check']
+    game.undo()
+    game.undo()
+    play(game, 'f7 f6', 'a2 a3', 'g7 g5', 'd1 h5')
+    assert game.moves[-1]['mate']
+
+def test_stalemate():
+    for detect_game_end in (True, False):
+        game = Chess.from_fen('k7/8/2Q5/8/8/8/8/K7 w - - 0 1')
+        game.add_player(Player(COLOR.white))
+        game.add_player(Player(COLOR.black))
+        game.start()
+        game.detect_game_end = detect_game_end
+        try:
+            play(game, 'c6 b6')
+            assert not detect_game_end
+        except GameOver:
+            assert detect_game_end
+        assert game.status() == STALEMATE
+        try:
+            play(game, 'a8 b8')
+            assert False
+        except GameOver:
+            pass
+        assert game.over
+
+def test_view():
+    game = new_game()
+    view = game.view
+    key = game.board.grid.key
+    assert game.results_in_check(game.board['e2'].piece, 'e4') is False
+    assert game.board.grid.key == key and not game.moves
+    play(game, 'e2 e4', 'd7 d5')
+    assert view.ply == 0 and view.piece_moves('e4') == [] # not changed by the moves
+    assert sorted(view.legal_moves()) == sorted(new_game().legal_moves())
+    view = game.view
+    assert view.ply == 2 and view.turn == COLOR.white
+    assert sorted(view.piece_moves('e4')) == ['d5', 'e5']
+    assert view.can_move('e4', 'd5') and not view.can_move('e4', 'e6')
+    assert sorted(view.legal_moves()) == sorted(game.legal_moves())
+
+    # readers in other threads while the game goes on
+    results = []
+    def spectate():
+        for _ in range(50):
+            view = game.view
+            results.append((view.ply, len(view.legal_moves())))
+    spectators = [threading.Thread(target=spectate) for _ in range(4)]
+    for thread in spectators:
+        thread.start()
+    play(game, 'g1 f3', 'b8 c6', 'f1 b5', 'c8 d7')
+    for thread in spectators:
+        thread.join()
+    assert len(results) == 200
+    assert game.view.is_in_check(COLOR.white) is False
+
+def test_undo():
+    game = Chess.from_fen('4k3/1P6/8/3pP3/8/8/8/4K3 w - d6 0 1')
+    game.add_player(Player(COLOR.white))
+    game.add_player(Player(COLOR.black))
+    game.start()
+    pawn, fens = game.board['b7'].piece, [game.fen()]
+    for move in ('e5 d6', 'e8 d7', 'b7 b8'):
+        play(game, move)
+        fens.append(game.fen())
+    assert game.pieces[pawn.piece_id] is not pawn # promoted
+    assert game.undo() == ('b7', 'b8')
+    assert game.pieces[pawn.piece_id] is pawn and pawn.position == 'b7'
+    game.goto(0)
+    assert game.fen() == fens[0] and not game.captured[COLOR.black]
+    assert game.board['d5'].piece.captured is False
+    assert game.undo() is None
+    game.goto(3)
+    assert game.fen() == fens[3] and len(game.captured[COLOR.black]) == 1
+    assert [move_name(move) for move in game.moves.codes] == ['e5d6', 'e8d7', 'b7b8q']
+    game.goto(1)
+    assert game.view.ply == 1
+    play(game, 'e8 f7') # a new move forgets the moves taken back
+    assert game.redo() is None
+    try:
+        game.goto(3)
+        assert False
+    except IndexError:
+        pass
+
+def test_squares():
+    game = new_game()
+    pawn = game.board['e2'].piece
+    assert (pawn.square, pawn.position) == (12, 'e2')
+    play(game, 'e2 e4', 'a7 a6', 'e4 e5')
+    assert (pawn.square, pawn.position) == (36, 'e5')
+    assert pawn.moves == [('e2', 'e4', 0), ('e4', 'e5', 2)]
+    assert pawn.get_starting_position() == 'e2'
+    for item in (pawn, game.board, game.board.grid, game.board['e5'], game.players[COLOR.white]):
+        assert not hasattr(item, '__dict__')
+
+def test_move_log():
+    game = new_game()
+    pawn = game.board['e2'].piece
+    play(game, 'e2 e4', 'a7 a6', 'e4 e5', 'd7 d5', 'e5 d6')
+    log = game.moves
+    assert [move_name(move) for move in log.codes] == ['e2e4', 'a7a6', 'e4e5', 'd7d5', 'e5d6']
+    assert move_flags(log.codes[0]) == DOUBLE_PUSH
+    assert move_flags(log.codes[4]) == EN_PASSANT and is_capture(log.codes[4])
+    last = log[-1]
+    assert (last['move_from'], last['move_to'], last['move_id']) == ('e5', 'd6', 4)
+    assert last['piece'] is pawn and last['captured'].position == 'd5'
+    assert not last['check']
+
+    game = Chess.from_fen('8/P6k/8/8/8/8/8/K7 w - - 0 1')
+    game.add_player(Player(COLOR.white))
+    game.add_player(Player(COLOR.black))
+    game.start()
+    pawn = game.board['a7'].piece
+    play(game, 'a7 a8')
+    queen = game.board['a8'].piece
+    assert promotion(game.moves.codes[0]) == QUEEN
+    assert game.moves[0]['piece'] is queen
+    play(game, 'h7 g7', 'a8 a2')
+    assert [entry['piece'] for entry in game.moves] == [queen, game.board['g7'].piece, queen]
+    assert queen.moves == [('a7', 'a8', 0), ('a8', 'a2', 2)]
+    assert pawn.promoted_piece is queen
+
+def test_check_move():
+    game = Chess()
+    assert game.check_move('e2', 'e4') == (False, REASON.not_started)
+    game = new_game()
+    assert game.check_move('e2', 'e4') == (True, REASON.legal)
+    assert game.check_move('e7', 'e5') == (False, REASON.not_your_turn)
+    assert game.check_move('e2', 'e5') == (False, REASON.bad_geometry)
+    assert game.check_move('a1', 'a3') == (False, REASON.blocked)
+    assert game.check_move('b1', 'd2') == (False, REASON.own_piece)
+    assert game.check_move('d2', 'e3') == (False, REASON.nothing_to_capture)
+    assert game.check_move('e3', 'e4') == (False, REASON.no_piece)
+    assert game.check_move('e2', 'e9') == (False, REASON.invalid_position)
+    play(game, 'e2 e4', 'd7 d5', 'f1 b5')
+    assert game.check_move('a7', 'a6') == (False, REASON.king_in_check)
+    assert game.board['c7'].piece.check_move('c6') == (True, REASON.legal)
+    try:
+        play(game, 'a7 a6')
+        assert False
+    except IllegalMove as e:
+        assert str(e) == "You can't put your king in check"
+
+def main():
+    test_opening()
+    test_en_passant()
+    test_push_pop()
+    test_board_move()
+    test_push_piece_square()
+    test_position_key()
+    test_attackers()
+    test_check_evasion()
+    test_fools_mate()
+    test_lazy_game_end()
+    test_stalemate()
+    test_view()
+    test_undo()
+    test_squares()
+    test_move_log()
+    test_check_move()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""Testing"""
+from chess import Chess
+from chess.perft import POSITIONS, PerftTable
+
+def test_positions():
+    for name, position, counts in POSITIONS:
+        game = Chess.from_fen(position)
+        for depth, count in enumerate(counts[:3], 1):
+            assert game.perft(depth) == count, name
+
+def test_divide():
+    game = Chess()
+    divided = game.divide(2)
+    assert len(divided) == 20
+    assert divided[('e2', 'e4')] == 20
+    assert sum(divided.values()) == 400
+
+def test_table():
+    for name, position, counts in POSITIONS:
+        game = Chess.from_fen(position)
+        key = game.position_key()
+        table = PerftTable(1 << 12)
+        assert game.perft(4, table) == counts[3], name
+        hits = table.hits
+        assert game.perft(4, table) == counts[3], name
+        assert table.hits > hits
+        assert game.position_key() == key
+
+def main():
+    test_positions()
+    test_divide()
+    test_table()
+
+if __name__ == '__main__':
+    main()
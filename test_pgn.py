@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Testing"""
+import io
+from chess import Chess, Player
+from chess.colors import COLOR
+from chess.exceptions import GameOver
+from chess.pgn import read_games, format_game
+
+ARCHIVE = '''[Event "Annotated"]
+[White "A \\"B\\""]
+[Result "1-0"]
+
+1. e4 {a comment
+over two lines} e5 (1... c5 2. Nf3 (2. c3)) 2. Nf3 $1 Nc6 ; the rest of the line
+3. Bb5 a6 1-0
+
+[Event "Castling"]
+[Result "*"]
+
+1. e4 e5 2. Nf3 Nc6 3. Bc4 Nf6 4. O-O *
+
+[Event "Set up"]
+[SetUp "1"]
+[FEN "7k/8/8/8/8/8/8/K6R b - - 0 1"]
+
+1... Kg7 2. Rh2 *
+'''
+
+def new_game():
+    game = Chess()
+    game.add_player(Player(COLOR.white))
+    game.add_player(Player(COLOR.black))
+    game.start()
+    return game
+
+def test_read():
+    games = list(read_games(io.StringIO(ARCHIVE)))
+    assert len(games) == 3
+    annotated, castling, set_up = games
+    assert annotated.headers['White'] == 'A "B"'
+    assert annotated.result == '1-0'
+    assert annotated.moves == [('e2', 'e4'), ('e7', 'e5'), ('g1', 'f3'), ('b8', 'c6'),
+                               ('f1', 'b5'), ('a7', 'a6')]
+    assert annotated.error is None
+    assert len(castling.moves) == 6
+    assert 'Castling' in castling.error
+    assert set_up.moves == [('h8', 'g7'), ('h1', 'h2')]
+    unresolved = next(read_games(io.StringIO(ARCHIVE), resolve=False))
+    assert unresolved.moves == ['e4', 'e5', 'Nf3', 'Nc6', 'Bb5', 'a6']
+
+def test_write():
+    game = new_game()
+    moves = [('f2', 'f3'), ('e7', 'e5'), ('g2', 'g4'), ('d8', 'h4')]
+    try:
+        for old_position, new_position in moves:
+            game.move(game.board[old_position].piece, new_position)
+    except GameOver:
+        pass
+    text = format_game(game, {'White': 'Fool'})
+    assert '[White "Fool"]' in text
+    assert text.endswith('1. f3 e5 2. g4 Qh4# 0-1\n')
+    written = next(read_games(io.StringIO(text)))
+    assert written.moves == moves
+    assert written.result == '0-1'
+
+def test_write_from_fen():
+    game = Chess.from_fen('7k/8/8/8/8/8/8/K6R b - - 0 1')
+    game.add_player(Player(COLOR.white))
+    game.add_player(Player(COLOR.black))
+    game.start()
+    game.move(game.board['h8'].piece, 'g7')
+    text = format_game(game)
+    assert '[FEN "7k/8/8/8/8/8/8/K6R b - - 0 1"]' in text
+    assert text.endswith('1... Kg7 *\n')
+
+def main():
+    test_read()
+    test_write()
+    test_write_from_fen()
+
+if __name__ == '__main__':
+    main()
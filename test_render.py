@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""Testing"""
+from chess import Chess, Player
+from chess.colors import COLOR
+from chess.render import TerminalRenderer, CLEAR_SCREEN, move_cursor
+
+def new_game():
+    game = Chess()
+    game.add_player(Player(COLOR.white))
+    game.add_player(Player(COLOR.black))
+    game.start()
+    return game
+
+def play(game, *moves):
+    for move in moves:
+        old_position, new_position = move.split()
+        game.move(game.board[old_position].piece, new_position)
+
+def test_incremental_frames():
+    game = new_game()
+    renderer = TerminalRenderer(game)
+    frame = renderer.frame()
+    assert frame.startswith(CLEAR_SCREEN)
+    assert renderer.frame() == ''
+
+    play(game, 'e2 e4')
+    frame = renderer.frame()
+    # e2 and e4, and the first row of the log column
+    assert frame.count('\x1b[') - frame.count('m') == 3
+    assert move_cursor(9, 16) in frame and move_cursor(7, 16) in frame
+    assert move_cursor(1, 31) in frame and 'e4' in frame
+
+    play(game, 'd7 d5', 'e4 d5')
+    frame = renderer.frame()
+    assert move_cursor(12, 4) in frame # the captured pawn, below the board
+    assert move_cursor(3, 31) in frame and 'exd5' in frame
+
+    renderer.reset()
+    assert renderer.frame().startswith(CLEAR_SCREEN)
+
+def main():
+    test_incremental_frames()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Testing"""
+import asyncio
+from chess.server import GameServer
+
+async def session(lines):
+    server = GameServer(workers=1, search_depth=2)
+    listener = await server.start_tcp()
+    port = listener.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    replies = []
+    for line in lines:
+        writer.write(line.encode() + b'\n')
+        await writer.drain()
+        replies.append((await reader.readline()).decode().rstrip('\n'))
+    writer.write(b'quit\n')
+    assert await reader.readline() == b'' # closed by the server
+    writer.close()
+    listener.close()
+    await listener.wait_closed()
+    server.shutdown()
+    return replies
+
+def test_commands():
+    replies = asyncio.run(session([
+        'new',
+        'move 1 f2 f3',
+        'move 1 e7 e5',
+        'move 1 e2 e9',
+        'move 1 g2 g4',
+        'moves 1',
+        'move 1 d8 h4',
+        'moves 1',
+        'move 1 a2 a3',
+        'new 7k/8/6K1/8/8/8/5Q2/8 w - - 0 1',
+        'search 2',
+        'fen 2',
+        'eval 2',
+        'close 2',
+        'fen 2',
+        'dance',
+        'move 1',
+    ]))
+    assert replies[:3] == ['ok 1', 'ok -', 'ok -']
+    assert replies[3] == "error IllegalMove 'e9' doesn't look like a valid position"
+    assert replies[4] == 'ok -' and 'd8h4' in replies[5].split()
+    assert replies[6:9] == ['ok mate', 'ok', 'error GameOver The game is already over']
+    assert replies[9] == 'ok 2'
+    move, score, depth = replies[10].split()[1:]
+    assert int(score) > 0 and int(depth) >= 1
+    assert replies[11] == 'ok 7k/8/6K1/8/8/8/5Q2/8 w - - 0 1'
+    assert replies[12].startswith('ok ') and int(replies[12].split()[1]) > 800
+    assert replies[13:] == ['ok', 'error CommandError No game 2',
+                            "error CommandError Unknown command 'dance'",
+                            'error CommandError Wrong number of arguments for move']
+
+def main():
+    test_commands()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Testing"""
+import io
+import os
+import tempfile
+from chess import Chess, Player
+from chess.colors import COLOR
+from chess.tensors import to_planes, archive_planes, save_memmap, EN_PASSANT, SIDE_TO_MOVE
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def new_game():
+    game = Chess()
+    game.add_player(Player(COLOR.white))
+    game.add_player(Player(COLOR.black))
+    game.start()
+    return game
+
+def test_planes():
+    if numpy is None:
+        return
+    game = new_game()
+    game.move(game.board['e2'].piece, 'e4')
+    planes = to_planes([Chess(), game, game.snapshot(), game.view])
+    assert planes.shape == (4, 14, 8, 8) and planes.dtype == numpy.uint8
+    start, after = planes[0], planes[1]
+    assert start[:12].sum() == 32 and start[0, 1].all() and start[11, 7, 4] == 1
+    assert after[0, 3, 4] == 1 and after[0, 1, 4] == 0
+    assert after[SIDE_TO_MOVE].all() and not start[SIDE_TO_MOVE].any()
+    assert after[EN_PASSANT, 2, 4] == 1 and after[EN_PASSANT].sum() == 1
+    assert (planes[1] == planes[2]).all() and (planes[1] == planes[3]).all()
+
+def test_archive():
+    if numpy is None:
+        return
+    archive = io.StringIO('[Event "?"]\n\n1. e4 e5 2. Nf3 *\n\n[Event "?"]\n\n1. d4 *\n')
+    chunks = list(archive_planes(archive, chunk_size=4))
+    assert [len(chunk) for chunk in chunks] == [4, 2]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'positions.npy')
+        save_memmap([Chess().snapshot()] * 3, path, chunk_size=2)
+        assert (numpy.load(path) == to_planes([Chess()] * 3)).all()
+
+def main():
+    test_planes()
+    test_archive()
+
+if __name__ == '__main__':
+    main()
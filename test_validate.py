@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Testing"""
+import io
+from chess import Chess
+from chess.validate import validate_games
+
+ARCHIVE = '''[Event "Fool's mate"]
+
+1. f3 e5 2. g4 Qh4# 0-1
+
+[Event "Illegal"]
+
+1. e4 e5 2. Ke3 Nc6 *
+
+[Event "Stalemate"]
+[FEN "7k/8/6K1/8/8/8/5Q2/8 w - - 0 1"]
+
+1. Qf7 1/2-1/2
+
+[Event "Invalid FEN"]
+[FEN "8/8/8 w - - 0 1"]
+
+*
+'''
+
+def test_reports():
+    reports = list(validate_games(io.StringIO(ARCHIVE), workers=1))
+    assert [report.number for report in reports] == [1, 2, 3, 4]
+    mate, illegal, stalemate, invalid = reports
+    assert mate.legal and mate.moves == 4
+    assert mate.result == mate.outcome == '0-1'
+    assert mate.position_key == Chess.from_fen(
+        'rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w - - 1 3').position_key()
+    assert not illegal.legal
+    assert illegal.bad_ply == 3 and illegal.moves == 2
+    assert 'Ke3' in illegal.error
+    assert stalemate.legal and stalemate.outcome == '1/2-1/2'
+    assert not invalid.legal and invalid.bad_ply == 0
+
+def test_workers():
+    archive = ARCHIVE * 10
+    reports = list(validate_games(io.StringIO(archive), workers=1))
+    assert list(validate_games(io.StringIO(archive), workers=2, batch_size=3)) == reports
+
+def main():
+    test_reports()
+    test_workers()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""Validate the games of PGN archives. Prints a line for each game with its number,
+whether its moves are legal, the first illegal ply, the result in the archive and of
+the final position, and the key of the final position."""
+import argparse
+import sys
+import time
+from chess.validate import validate_games
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('files', nargs='+', metavar='file', help='PGN files')
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help='number of worker processes, one per CPU by default')
+    parser.add_argument('-b', '--batch-size', type=int, default=64,
+                        help='games sent to a worker at a time, %(default)s by default')
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help='only print the illegal games and the summary')
+    args = parser.parse_args()
+
+    games = illegal = moves = 0
+    started = time.perf_counter()
+    for path in args.files:
+        for report in validate_games(path, args.workers, args.batch_size):
+            games += 1
+            moves += report.moves
+            if not report.legal:
+                illegal += 1
+            elif args.quiet:
+                continue
+            key = '-' if report.position_key is None else f'{report.position_key:016x}'
+            status = 'legal' if report.legal else f'illegal at ply {report.bad_ply}: {report.error}'
+            print(f'{path}\t{report.number}\t{status}\t{report.result}\t{report.outcome}\t{key}')
+    elapsed = time.perf_counter() - started
+
+    print(f'{games} games, {illegal} illegal, {moves} moves in {elapsed:.3f}s, '
+          f'{games / max(elapsed, 1e-9):.0f} games/s', file=sys.stderr)
+    return 1 if illegal else 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())